@@ -0,0 +1,78 @@
+import glob
+import os
+import re
+import shutil
+from typing import Optional
+
+
+class BrowserProfile:
+    """
+    Perfil persistente do Chrome (--user-data-dir).
+
+    Mantém cookies de consentimento e o cache de disco entre execuções.
+    O caminho pode ser um template com "{worker}" para gerar um perfil por
+    worker em execuções paralelas (Chrome não aceita dois processos no
+    mesmo user-data-dir); cada worker nasce como cópia do perfil "seed".
+    """
+
+    # arquivos de lock do Chrome que não podem ser copiados entre perfis
+    LOCK_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile")
+
+    # gravado após um open() completo (consentimento resolvido, tabela carregada)
+    WARM_MARKER = "yahoo-ready"
+
+    def __init__(self, template: str, seed: Optional[str] = None):
+        self.template = os.path.expanduser(template)
+        # perfil de origem para cópias por worker (default: worker 0)
+        self.seed = os.path.expanduser(seed) if seed else self.path(0)
+
+    @property
+    def per_worker(self) -> bool:
+        return "{worker}" in self.template
+
+    def path(self, worker: int = 0) -> str:
+        return self.template.format(worker=worker) if self.per_worker else self.template
+
+    def is_warm(self, worker: int = 0) -> bool:
+        # "Default/" não basta: o Chrome cria na 1ª execução mesmo se ela quebrou
+        # antes do banner de consentimento
+        return os.path.isfile(os.path.join(self.path(worker), self.WARM_MARKER))
+
+    def mark_warm(self, worker: int = 0) -> None:
+        """Registra que um open() completou com este perfil (cookie de consentimento gravado)."""
+        path = self.path(worker)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, self.WARM_MARKER), "w", encoding="utf-8") as f:
+            f.write("ok\n")
+
+    def prepare(self, worker: int = 0) -> str:
+        """Retorna o diretório do worker, copiando o seed se ainda não existir."""
+        target = self.path(worker)
+        if os.path.isdir(target):
+            return target
+
+        if self.per_worker and target != self.seed and os.path.isdir(self.seed):
+            shutil.copytree(self.seed, target, ignore=shutil.ignore_patterns(*self.LOCK_FILES))
+        else:
+            os.makedirs(target, exist_ok=True)
+        return target
+
+    def reset(self, worker: Optional[int] = None) -> None:
+        """Apaga o perfil de um worker ou, sem argumento, todos (incluindo o seed)."""
+        if worker is not None:
+            targets = [self.path(worker)]
+        else:
+            targets = self._worker_paths() + [self.seed]
+
+        for t in targets:
+            shutil.rmtree(t, ignore_errors=True)
+
+    def _worker_paths(self) -> list[str]:
+        """Diretórios existentes que path(n) poderia ter gerado ({worker} -> dígitos)."""
+        if not self.per_worker:
+            return [self.template]
+        parts = self.template.split("{worker}")
+        # "*" do glob só pré-filtra; a regex garante que o trecho do worker é numérico
+        candidates = glob.glob("*".join(glob.escape(p) for p in parts))
+        pattern = re.compile(r"\d+".join(re.escape(p) for p in parts))
+        return [c for c in candidates if pattern.fullmatch(c)]
@@ -1,16 +1,225 @@
 import argparse
+import contextlib
+import os
+import sys
+
+from app.browser_profile import BrowserProfile
 from app.crawler_service import CrawlerService
+from app.engines.http_engine import HttpScreenerEngine, bootstrap_session
+from app.selenium_client import SeleniumClient
+from app.ndjson_writer import NdjsonWriter
+from app.price_store import PriceStore
+from app.symbol_index import SharedSymbolIndex
+from app.wait_scheduler import WaitScheduler
+
 
-def main():
+def crawl(argv):
     parser = argparse.ArgumentParser()
     parser.add_argument("--region", required=True)
-    parser.add_argument("--output", default="equities.csv")
-    args = parser.parse_args()
+    parser.add_argument("--output", default=None, help="default: equities.csv (csv) ou stdout (ndjson)")
+    parser.add_argument(
+        "--format",
+        choices=("csv", "ndjson"),
+        default="csv",
+        help="ndjson: transmite as linhas à medida que cada página é parseada",
+    )
+    parser.add_argument("--db", default=None, help="grava também no histórico SQLite (ex.: prices.db)")
+    parser.add_argument(
+        "--user-data-dir",
+        default=None,
+        help="perfil persistente do Chrome (aceita template com {worker})",
+    )
+    parser.add_argument("--worker", type=int, default=0, help="índice do worker para o template de perfil")
+    parser.add_argument("--reset-profile", action="store_true", help="apaga o perfil antes de iniciar")
+    parser.add_argument(
+        "--command-stats",
+        action="store_true",
+        help="conta os comandos WebDriver por call site e imprime o resumo",
+    )
+    parser.add_argument(
+        "--wait-stats",
+        default=None,
+        help="arquivo JSON com as latências dos waits (carregado e atualizado a cada execução)",
+    )
+    parser.add_argument(
+        "--symbol-index",
+        default=None,
+        help="índice de símbolos em disco compartilhado entre regiões/processos (dedupe global)",
+    )
+    parser.add_argument(
+        "--index-run",
+        default=None,
+        help="rótulo do run no índice (o mesmo em todos os processos que deduplicam entre si); "
+        "sem ele cada execução abre um run novo",
+    )
+    parser.add_argument("--reset-symbol-index", action="store_true", help="apaga o índice antes de iniciar")
+    parser.add_argument(
+        "--dedupe-by",
+        choices=("symbol", "issuer"),
+        default="symbol",
+        help="issuer: listagens cruzadas do mesmo emissor (ex.: BDRs) contam uma vez",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("selenium", "http"),
+        default="selenium",
+        help="http: usa o browser só para cookies/crumb e busca as páginas pela API",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="páginas em paralelo no engine http")
+    parser.add_argument(
+        "--shard",
+        action="store_true",
+        help="divide a região em fatias (setor/market cap) percorridas em paralelo",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="browsers em paralelo no modo --shard")
+    parser.add_argument("--max-slice-rows", type=int, default=5_000, help="tamanho máximo estimado de cada fatia")
+    args = parser.parse_args(argv)
+    if args.shard and args.engine != "selenium":
+        parser.error("--shard só se aplica ao engine selenium")
+    if args.shard and args.format != "csv":
+        parser.error("--shard só grava csv")
+
+    output = args.output or ("-" if args.format == "ndjson" else "equities.csv")
+
+    profile = BrowserProfile(args.user_data_dir) if args.user_data_dir else None
+    if profile and args.reset_profile:
+        profile.reset()
+
+    if args.symbol_index and args.reset_symbol_index:
+        SharedSymbolIndex.reset(args.symbol_index)
+
+    store = PriceStore(args.db) if args.db else None
+    index = SharedSymbolIndex(args.symbol_index, run=args.index_run) if args.symbol_index else None
+    waits = WaitScheduler(args.wait_stats) if args.wait_stats else None
+    try:
+        client = SeleniumClient(
+            profile=profile,
+            worker=args.worker,
+            track_commands=args.command_stats,
+            wait_scheduler=waits,
+        )
+        if args.engine == "http":
+            try:
+                session = bootstrap_session(client)
+            finally:
+                client.close()
+            engine = HttpScreenerEngine(session, concurrency=args.concurrency)
+            service = CrawlerService(store=store, engine=engine, index=index, dedupe_by=args.dedupe_by)
+        else:
+            service = CrawlerService(store=store, client=client, index=index, dedupe_by=args.dedupe_by)
+
+        if args.shard:
+            # um perfil por worker só com template {worker}; senão perfis descartáveis
+            worker_profile = profile if profile and profile.per_worker else None
+
+            def client_factory(worker_id):
+                return SeleniumClient(
+                    profile=worker_profile,
+                    worker=args.worker + 1 + worker_id,
+                    wait_scheduler=waits,
+                )
+
+            report = service.run_sharded(
+                args.region,
+                output,
+                client_factory,
+                workers=args.workers,
+                max_slice_rows=args.max_slice_rows,
+            )
+            total = report.collected
+            print(f"{len(report.slices)} fatias; esperado={report.expected} coletado={report.collected}")
+            if report.missing:
+                print(f"AVISO: {report.missing} ativos fora das fatias (ex.: sem setor/market cap)")
+            for s in report.oversized:
+                print(f"AVISO: fatia '{s.label}' estimada em {s.estimate} linhas (> --max-slice-rows) e sem filtro para dividir")
+        elif args.format == "ndjson":
+            total = stream_ndjson(service, args.region, output)
+        else:
+            total = service.run(args.region, output)
+    finally:
+        if store:
+            store.close()
+        if index:
+            index.close()
+        if waits:
+            waits.save()
+
+    # em ndjson o stdout é dos dados: resumo vai para o stderr
+    summary = sys.stderr if args.format == "ndjson" else sys.stdout
+    if client.command_stats:
+        print(client.command_stats.format(), file=summary)
+
+    print(f"{total} ativos coletados", file=summary)
+
+
+def stream_ndjson(service: CrawlerService, region: str, output: str) -> int:
+    """
+    Escreve NDJSON em stdout ("-") ou arquivo, página a página.
+    Logs do crawl são desviados para o stderr para não sujar o stream.
+    """
+    writer = NdjsonWriter()
+    out = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    if out is sys.stdout and hasattr(out, "reconfigure"):
+        out.reconfigure(line_buffering=True)
+
+    total = 0
+    pages = service.iter_new_pages(region)
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            for new_rows in pages:
+                total += writer.write_rows(new_rows, out)
+    except BrokenPipeError:
+        # consumidor fechou o pipe (ex.: "| head"): encerra o crawl sem traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        pages.close()
+        if out is not sys.stdout:
+            out.close()
+    return total
+
+
+def query(argv):
+    parser = argparse.ArgumentParser(prog="app.cli query")
+    parser.add_argument("--db", default="prices.db")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_latest = sub.add_parser("latest", help="snapshot do run mais recente da região")
+    p_latest.add_argument("--region", required=True)
+    p_latest.add_argument("--include-unfinished", action="store_true", help="considera runs não concluídos")
+
+    p_history = sub.add_parser("history", help="histórico de preços de um símbolo")
+    p_history.add_argument("symbol")
+
+    p_movers = sub.add_parser("movers", help="maiores variações entre os dois últimos runs")
+    p_movers.add_argument("--region", required=True)
+    p_movers.add_argument("--limit", type=int, default=10)
+    p_movers.add_argument("--include-unfinished", action="store_true", help="considera runs não concluídos")
+
+    args = parser.parse_args(argv)
+
+    store = PriceStore(args.db)
+    try:
+        if args.command == "latest":
+            for r in store.latest_snapshot(args.region, include_unfinished=args.include_unfinished):
+                print(f"{r['symbol']}\t{r['name']}\t{r['price']}")
+        elif args.command == "history":
+            for r in store.history(args.symbol):
+                print(f"{r['ts']:.0f}\trun={r['run_id']}\t{r['region']}\t{r['price']}")
+        elif args.command == "movers":
+            for r in store.top_movers(args.region, limit=args.limit, include_unfinished=args.include_unfinished):
+                print(f"{r['symbol']}\t{r['price_from']} -> {r['price_to']}\t{r['change_pct']:+.2f}%")
+    finally:
+        store.close()
+
 
-    service = CrawlerService()
-    total = service.run(args.region, args.output)
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
 
-    print(f"{total} ativos coletados")
+    # "query ..." consulta o histórico; qualquer outra coisa é um crawl
+    if argv and argv[0] == "query":
+        query(argv[1:])
+    else:
+        crawl(argv)
 
 if __name__ == "__main__":
     main()
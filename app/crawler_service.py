@@ -1,41 +1,237 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, Optional, Sequence, Union
+
+from app.engines.base import ScreenerEngine
+from app.engines.selenium_engine import SeleniumEngine
 from app.selenium_client import SeleniumClient
 from app.parser import EquityParser
 from app.csv_writer import CsvWriter
+from app.price_store import PriceStore
+from app.query_planner import DEFAULT_DIMENSIONS, QueryPlanner, ShardReport
+from app.symbol_index import SharedSymbolIndex, SymbolIndex, issuer_key
 from app.pages.yahoo_screener_page import YahooScreenerPage
 
 
 class CrawlerService:
-    def __init__(self):
-        self.client = SeleniumClient()
+    def __init__(
+        self,
+        store: Optional[PriceStore] = None,
+        client: Optional[SeleniumClient] = None,
+        engine: Optional[ScreenerEngine] = None,
+        index: Optional[Union[SymbolIndex, SharedSymbolIndex]] = None,
+        dedupe_by: str = "symbol",
+    ):
+        # com engine próprio (ex.: HTTP) não sobe Chrome
+        self.engine = engine
+        self.client = client if (client or engine) else SeleniumClient()
         self.parser = EquityParser()
         self.writer = CsvWriter()
+        self.store = store
+        # índice compartilhado entre regiões/workers; sem ele, um novo por execução
+        self.index = index
+        self.dedupe_by = dedupe_by
 
     def run(self, region: str, output: str) -> int:
+        pages = self.iter_new_pages(region)
         try:
-            page = YahooScreenerPage(self.client, debug=True)
-            page.open()
-            page.apply_region(region)
-
-            seen = set()
             total = 0
 
-            for table_html in page.iter_pages_table_html():
-                rows = self.parser.parse(table_html)
+            for new_rows in pages:
+                self.writer.write_rows(new_rows, output)
+                total += len(new_rows)
+
+            return total
+
+        finally:
+            pages.close()
+
+    def iter_rows(self, region: str) -> Iterator[dict]:
+        """Linhas deduplicadas, à medida que cada página é parseada (sem passar por arquivo)."""
+        pages = self.iter_new_pages(region)
+        try:
+            for new_rows in pages:
+                yield from new_rows
+        finally:
+            pages.close()
 
-                new_rows = []
+    async def aiter_rows(self, region: str, buffer: int = 1_000) -> AsyncIterator[dict]:
+        """
+        Variante async de iter_rows: o crawl roda numa thread e entrega as linhas
+        por uma fila limitada (buffer), então um consumidor lento segura o crawl.
+        """
+        loop = asyncio.get_running_loop()
+        rows_q: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        stop = threading.Event()
+        done = object()
 
-                for r in rows:
-                    key = (r.get("symbol") or "").strip()
+        def produce():
+            rows = self.iter_rows(region)
+            item = done
+            try:
+                for row in rows:
+                    if stop.is_set():
+                        break
+                    asyncio.run_coroutine_threadsafe(rows_q.put(row), loop).result()
+            except BaseException as e:
+                item = e
+            finally:
+                rows.close()
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(rows_q.put(item), loop).result()
 
-                    if key and key not in seen:
-                        seen.add(key)
-                        new_rows.append(r)
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await rows_q.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # consumidor saiu antes do fim: libera o produtor preso na fila cheia
+            stop.set()
+            while not producer.done():
+                while not rows_q.empty():
+                    rows_q.get_nowait()
+                await asyncio.sleep(0.01)
+            await producer
 
+    def iter_new_pages(self, region: str) -> Iterator[list[dict]]:
+        """
+        Uma lista de linhas novas (dedupe por símbolo) por página do engine.
+        Com store, cada página é gravada no histórico antes de ser entregue;
+        o histórico recebe todos os símbolos da região, só a saída passa pelo
+        índice global/dedupe por emissor.
+        """
+        engine = self.engine or SeleniumEngine(self.client, self.parser, YahooScreenerPage)
+        try:
+            seen = SymbolIndex()
+            output_index = self._output_index()
+            run_id = self.store.begin_run(region) if self.store else None
+
+            for rows in engine.iter_page_rows(region):
+                region_rows = self._take_new(rows, seen)
+                if region_rows:
+                    self._record(region_rows, region, run_id)
+                new_rows = self._take_output(region_rows, output_index)
                 if new_rows:
-                    self.writer.write_rows(new_rows, output)
-                    total += len(new_rows)
+                    yield new_rows
 
-            return total
+            if self.store:
+                self.store.finish_run(run_id)
 
+        finally:
+            engine.close()
+
+    def run_sharded(
+        self,
+        region: str,
+        output: str,
+        client_factory: Callable[[int], SeleniumClient],
+        workers: int = 4,
+        max_slice_rows: int = 5_000,
+        dimensions: Sequence = DEFAULT_DIMENSIONS,
+    ) -> ShardReport:
+        """
+        Divide a região em fatias disjuntas de filtros (QueryPlanner) e percorre
+        as fatias em paralelo, um browser por worker (client_factory(worker_id)).
+        O dedupe por símbolo é o mesmo do run(); o total coletado é comparado
+        com o total da região sem fatiar.
+        """
+        # planejamento: estimativas pelo contador de resultados, no client principal
+        try:
+            page = YahooScreenerPage(self.client, debug=True)
+            page.open()
+
+            def estimate(slice_):
+                page.set_filters(slice_.as_dict)
+                return page.get_result_count()
+
+            expected, slices = QueryPlanner(estimate, dimensions, max_slice_rows, debug=True).plan(region)
         finally:
             self.client.close()
+
+        report = ShardReport(region, expected, slices=slices)
+        run_id = self.store.begin_run(region) if self.store else None
+        seen = SymbolIndex()
+        output_index = self._output_index()
+        lock = threading.Lock()
+
+        pending: queue.Queue = queue.Queue()
+        for slice_ in slices:
+            pending.put(slice_)
+
+        def worker(worker_id: int) -> None:
+            client = client_factory(worker_id)
+            try:
+                page = YahooScreenerPage(client, debug=True)
+                page.open()
+                while True:
+                    try:
+                        slice_ = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    page.set_filters(slice_.as_dict)
+                    for table_html in page.iter_pages_table_html():
+                        rows = self.parser.parse(table_html)
+                        # dedupe + escrita serializados entre workers
+                        with lock:
+                            region_rows = self._take_new(rows, seen)
+                            if region_rows:
+                                self._record(region_rows, region, run_id)
+                                report.collected += len(region_rows)
+                            new_rows = self._take_output(region_rows, output_index)
+                            if new_rows:
+                                self.writer.write_rows(new_rows, output)
+            finally:
+                client.close()
+
+        n_workers = max(1, min(workers, len(slices)))
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            for future in [pool.submit(worker, i) for i in range(n_workers)]:
+                future.result()
+
+        if self.store:
+            self.store.finish_run(run_id)
+
+        return report
+
+    def _output_index(self) -> Optional[Union[SymbolIndex, SharedSymbolIndex]]:
+        """Índice que filtra a saída: o compartilhado, um por execução (dedupe por emissor) ou nenhum."""
+        if self.index is not None:
+            return self.index
+        return SymbolIndex() if self.dedupe_by == "issuer" else None
+
+    def _take_output(self, rows: list[dict], index) -> list[dict]:
+        if index is None or not rows:
+            return rows
+        return self._take_new(rows, index, self.dedupe_by)
+
+    @staticmethod
+    def _take_new(rows: list[dict], seen, dedupe_by: str = "symbol") -> list[dict]:
+        """
+        Linhas cuja chave ainda não está no índice. A chave é o símbolo ou,
+        com dedupe_by="issuer", o emissor (listagens cruzadas contam uma vez).
+        """
+        keyed = []
+
+        for r in rows:
+            symbol = (r.get("symbol") or "").strip()
+            if not symbol:
+                continue
+            issuer = issuer_key(r.get("name") or "")
+            key = f"issuer:{issuer}" if dedupe_by == "issuer" and issuer else symbol
+            keyed.append((r, key, issuer))
+
+        # uma chamada por página: no índice compartilhado vira uma transação
+        flags = seen.add_many([(key, issuer) for _, key, issuer in keyed])
+        return [r for (r, _, _), new in zip(keyed, flags) if new]
+
+    def _record(self, new_rows: list[dict], region: str, run_id: Optional[int]) -> None:
+        if self.store:
+            # uma transação por página
+            self.store.ingest(run_id, region, new_rows)
@@ -0,0 +1,73 @@
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Optional
+
+
+class CommandStats:
+    """
+    Contabiliza comandos WebDriver (round trips HTTP até o chromedriver)
+    por call site do código do app.
+    """
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.seconds: defaultdict = defaultdict(float)
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def record(self, site: str, command: str, elapsed: float) -> None:
+        key = (site, command)
+        self.calls[key] += 1
+        self.seconds[key] += elapsed
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.seconds.clear()
+
+    def summary(self, top: Optional[int] = None) -> list[dict]:
+        rows = [
+            {"site": site, "command": command, "calls": n, "seconds": self.seconds[(site, command)]}
+            for (site, command), n in self.calls.most_common()
+        ]
+        return rows[:top] if top else rows
+
+    def format(self, top: Optional[int] = 20) -> str:
+        lines = [f"{self.total} comandos WebDriver"]
+        for r in self.summary(top):
+            lines.append(f"{r['calls']:6d}  {r['seconds']:8.3f}s  {r['command']:<28} {r['site']}")
+        return "\n".join(lines)
+
+
+def _call_site() -> str:
+    """Primeiro frame do pacote app (fora deste módulo) na pilha atual."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and module != __name__:
+            code = frame.f_code
+            return f"{module.rsplit('.', 1)[-1]}:{getattr(code, 'co_qualname', code.co_name)}"
+        frame = frame.f_back
+    return "?"
+
+
+def instrument_driver(driver, stats: Optional[CommandStats] = None) -> CommandStats:
+    """
+    Envolve driver.execute (por onde passam todos os comandos, inclusive os
+    de WebElement) para contar e cronometrar cada round trip.
+    """
+    stats = stats or CommandStats()
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        site = _call_site()
+        t0 = time.perf_counter()
+        try:
+            return original(driver_command, params)
+        finally:
+            stats.record(site, driver_command, time.perf_counter() - t0)
+
+    driver.execute = execute
+    return stats
@@ -0,0 +1,17 @@
+from typing import Iterator, Protocol
+
+
+class ScreenerEngine(Protocol):
+    """
+    Fonte das linhas do screener para o CrawlerService.
+
+    iter_page_rows(region) produz uma lista de linhas ({"symbol", "name",
+    "price"}) por página de resultados, na ordem do screener; o dedupe e a
+    escrita ficam no CrawlerService. close() libera browser/conexões.
+    """
+
+    def iter_page_rows(self, region: str) -> Iterator[list[dict]]:
+        ...
+
+    def close(self) -> None:
+        ...
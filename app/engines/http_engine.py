@@ -0,0 +1,204 @@
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator
+from urllib.parse import quote
+
+import urllib3
+from urllib3.util.retry import Retry
+
+# Nome da região (como aparece no dropdown) -> código usado pela API do screener
+REGION_CODES = {
+    "argentina": "ar",
+    "australia": "au",
+    "austria": "at",
+    "belgium": "be",
+    "brazil": "br",
+    "canada": "ca",
+    "chile": "cl",
+    "china": "cn",
+    "denmark": "dk",
+    "finland": "fi",
+    "france": "fr",
+    "germany": "de",
+    "greece": "gr",
+    "hong kong": "hk",
+    "india": "in",
+    "indonesia": "id",
+    "ireland": "ie",
+    "israel": "il",
+    "italy": "it",
+    "japan": "jp",
+    "malaysia": "my",
+    "mexico": "mx",
+    "netherlands": "nl",
+    "new zealand": "nz",
+    "norway": "no",
+    "portugal": "pt",
+    "singapore": "sg",
+    "south africa": "za",
+    "south korea": "kr",
+    "spain": "es",
+    "sweden": "se",
+    "switzerland": "ch",
+    "taiwan": "tw",
+    "thailand": "th",
+    "turkey": "tr",
+    "united kingdom": "gb",
+    "united states": "us",
+}
+
+
+def region_code(region: str) -> str:
+    norm = region.strip().lower()
+    if norm in REGION_CODES:
+        return REGION_CODES[norm]
+    if len(norm) == 2:
+        return norm
+    raise ValueError(f"Região '{region}' sem código conhecido para a API do screener.")
+
+
+@dataclass(frozen=True)
+class YahooSession:
+    """Credenciais de uma sessão de browser: cookies de consentimento + crumb."""
+
+    cookies: dict
+    crumb: str
+    user_agent: str = "Mozilla/5.0"
+
+    @property
+    def headers(self) -> dict:
+        cookie = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        return {"Cookie": cookie, "User-Agent": self.user_agent}
+
+
+def fetch_crumb(pool: urllib3.PoolManager, base_url: str, cookies: dict, user_agent: str) -> str:
+    resp = pool.request(
+        "GET",
+        f"{base_url}/v1/test/getcrumb",
+        headers=YahooSession(cookies, "", user_agent).headers,
+    )
+    crumb = resp.data.decode("utf-8").strip()
+    if resp.status != 200 or not crumb:
+        raise RuntimeError(f"Não foi possível obter o crumb (HTTP {resp.status}).")
+    return crumb
+
+
+def bootstrap_session(client, base_url: str = "https://query1.finance.yahoo.com") -> YahooSession:
+    """
+    Sessão curta de browser só para obter cookies (consentimento) e o crumb;
+    depois disso o crawl inteiro roda sem Chrome.
+    """
+    from app.pages.yahoo_screener_page import YahooScreenerPage
+
+    client.open(YahooScreenerPage.URL)
+    YahooScreenerPage(client, debug=False)._accept_cookies_if_present()
+
+    cookies = {c["name"]: c["value"] for c in client.driver.get_cookies()}
+    user_agent = client.driver.execute_script("return navigator.userAgent;")
+    crumb = fetch_crumb(urllib3.PoolManager(), base_url, cookies, user_agent)
+    return YahooSession(cookies, crumb, user_agent)
+
+
+class HttpScreenerEngine:
+    """
+    Engine sem browser: busca as páginas de dados do screener direto na API
+    JSON, com pool de conexões keep-alive e várias páginas em paralelo.
+    """
+
+    SCREENER_PATH = "/v1/finance/screener"
+
+    def __init__(
+        self,
+        session: YahooSession,
+        base_url: str = "https://query1.finance.yahoo.com",
+        page_size: int = 100,
+        concurrency: int = 8,
+        timeout: float = 15.0,
+    ):
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.pool = urllib3.PoolManager(
+            maxsize=concurrency,
+            block=True,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None),
+        )
+
+    # ------------------ público ------------------
+
+    def iter_page_rows(self, region: str) -> Iterator[list[dict]]:
+        code = region_code(region)
+
+        # 1ª página em série: traz o total e define quantas páginas buscar
+        rows, total = self.fetch_page(code, 0)
+        yield rows
+
+        offsets = iter(range(self.page_size, total, self.page_size))
+
+        # janela deslizante: no máximo `concurrency` páginas em voo, e a próxima
+        # só é pedida quando o consumidor pega uma página (consumidor lento
+        # segura o crawl e a memória não cresce com o tamanho da região)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            window = deque(pool.submit(self.fetch_page, code, off) for off in islice(offsets, self.concurrency))
+            try:
+                while window:
+                    rows, _ = window.popleft().result()
+                    yield rows
+                    for off in islice(offsets, 1):
+                        window.append(pool.submit(self.fetch_page, code, off))
+            finally:
+                for future in window:
+                    future.cancel()
+
+    def fetch_page(self, code: str, offset: int) -> tuple[list[dict], int]:
+        body = {
+            "offset": offset,
+            "size": self.page_size,
+            "sortField": "intradaymarketcap",
+            "sortType": "DESC",
+            "quoteType": "EQUITY",
+            "query": {
+                "operator": "and",
+                "operands": [{"operator": "or", "operands": [{"operator": "eq", "operands": ["region", code]}]}],
+            },
+            "userId": "",
+            "userIdType": "guid",
+        }
+        resp = self.pool.request(
+            "POST",
+            f"{self.base_url}{self.SCREENER_PATH}?formatted=true&crumb={quote(self.session.crumb)}",
+            body=json.dumps(body).encode("utf-8"),
+            headers={**self.session.headers, "Content-Type": "application/json"},
+        )
+        if resp.status != 200:
+            raise RuntimeError(f"Screener HTTP {resp.status} (offset={offset}).")
+
+        result = json.loads(resp.data)["finance"]["result"][0]
+        return [self._row(q) for q in result.get("quotes", [])], int(result.get("total", 0))
+
+    def close(self) -> None:
+        self.pool.clear()
+
+    # ------------------ helpers ------------------
+
+    @staticmethod
+    def _row(q: dict) -> dict:
+        return {
+            "symbol": q.get("symbol", ""),
+            "name": q.get("longName") or q.get("shortName") or "",
+            "price": HttpScreenerEngine._price(q.get("regularMarketPrice")),
+        }
+
+    @staticmethod
+    def _price(value) -> str:
+        # formatted=true: {"raw": 19.95, "fmt": "19.95"}
+        if isinstance(value, dict):
+            return value.get("fmt") or ("" if value.get("raw") is None else f"{value['raw']:.2f}")
+        if value is None:
+            return ""
+        return f"{value:.2f}"
@@ -0,0 +1,24 @@
+from typing import Iterator
+
+from app.pages.yahoo_screener_page import YahooScreenerPage
+
+
+class SeleniumEngine:
+    """Engine padrão: renderiza o screener no Chrome e parseia o HTML da tabela."""
+
+    def __init__(self, client, parser, page_cls=YahooScreenerPage, debug: bool = True):
+        self.client = client
+        self.parser = parser
+        self.page_cls = page_cls
+        self.debug = debug
+
+    def iter_page_rows(self, region: str) -> Iterator[list[dict]]:
+        page = self.page_cls(self.client, debug=self.debug)
+        page.open()
+        page.apply_region(region)
+
+        for table_html in page.iter_pages_table_html():
+            yield self.parser.parse(table_html)
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,19 @@
+import json
+from typing import Iterable, TextIO
+
+
+class NdjsonWriter:
+    FIELDNAMES = ["symbol", "name", "price"]
+
+    def write_rows(self, rows: Iterable[dict], stream: TextIO) -> int:
+        """
+        Uma linha JSON por ativo, com flush ao fim de cada lote (página):
+        o consumidor do pipe recebe os dados assim que a página é parseada e,
+        se ele for mais lento, o write bloqueia e segura o crawl.
+        """
+        n = 0
+        for row in rows:
+            stream.write(json.dumps({k: row.get(k) for k in self.FIELDNAMES}, ensure_ascii=False) + "\n")
+            n += 1
+        stream.flush()
+        return n
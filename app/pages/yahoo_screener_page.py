@@ -15,14 +15,32 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver.support.ui import WebDriverWait
 
+from app.wait_scheduler import WaitScheduler
+
 
 @dataclass(frozen=True)
 class Locators:
-    # ------------------ Filters: Region ------------------
-    REGION_MENU_BUTTON = (
+    # ------------------ Screener container (escopo das buscas) ------------------
+    SCREENER_CONTAINER = (By.CSS_SELECTOR, "main")
+    BODY = (By.CSS_SELECTOR, "body")
+
+    # ------------------ Filters (Region, Sector, Market Cap, ...) ------------------
+    # CSS barato primeiro; o XPath (texto do botão) fica como fallback
+    FILTER_MENU_BUTTON_CSS = (By.CSS_SELECTOR, "button[aria-haspopup='true'][data-ylk*='slk:{name}']")
+    FILTER_MENU_BUTTON = (
         By.XPATH,
-        "//button[@aria-haspopup='true' and (contains(@data-ylk,'slk:Region') or .//div[normalize-space()='Region'])]",
+        "//button[@aria-haspopup='true' and (contains(@data-ylk,'slk:{name}') or .//div[normalize-space()='{name}'])]",
     )
+    REGION_MENU_BUTTON_CSS = (By.CSS_SELECTOR, FILTER_MENU_BUTTON_CSS[1].format(name="Region"))
+    REGION_MENU_BUTTON = (By.XPATH, FILTER_MENU_BUTTON[1].format(name="Region"))
+
+    @staticmethod
+    def filter_menu_button_css(name: str):
+        return (By.CSS_SELECTOR, Locators.FILTER_MENU_BUTTON_CSS[1].format(name=name))
+
+    @staticmethod
+    def filter_menu_button(name: str):
+        return (By.XPATH, Locators.FILTER_MENU_BUTTON[1].format(name=name))
 
     # ------------------ Dialogs (dropdown popovers) ------------------
     DIALOG_CONTAINERS = (By.CSS_SELECTOR, "div.dialog-container.menu-surface-dialog")
@@ -43,14 +61,11 @@ class Locators:
     # ------------------ Rows per page control ------------------    
     # Achar o botão "rows per page" de forma estável (não depender de classes).
     ROWS_PER_PAGE_BUTTON = (
-        By.XPATH,
-        "//button[@aria-haspopup='listbox' and contains(@data-ylk,'sec:screener-table') and contains(@data-ylk,'subsec:custom-screener')]",
+        By.CSS_SELECTOR,
+        "button[aria-haspopup='listbox'][data-ylk*='sec:screener-table'][data-ylk*='subsec:custom-screener']",
     )
     # Menu listbox que aparece ao clicar no botão (geralmente role=listbox + role=option nos itens)
-    LISTBOX_VISIBLE = (
-        By.XPATH,
-        "//*[@role='listbox' and (not(@aria-hidden) or @aria-hidden='false') and not(contains(@class,'tw-hidden'))]",
-    )
+    LISTBOX_VISIBLE = (By.CSS_SELECTOR, "[role='listbox']:not([aria-hidden='true']):not(.tw-hidden)")
     LISTBOX_OPTION_BY_VALUE = (
         By.XPATH,
         ".//*[@role='option' and normalize-space(.)='{value}']"
@@ -60,10 +75,12 @@ class Locators:
     )
 
     # ------------------ Empty state (generic) ------------------
+    # Relativo ao container e testando só os nós de texto próprios:
+    # translate(.) em "//*" recalcula o texto de todo o documento a cada nó.
     EMPTY_STATE = (
         By.XPATH,
-        "//*[contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'no results') "
-        "or contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'no matching')]",
+        ".//*[text()[contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'no results') "
+        "or contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'no matching')]]",
     )
 
     # ------------------ Cookie/consent (generic) ------------------
@@ -73,13 +90,74 @@ class Locators:
     )
 
 
+_JS_IS_DISABLED = (
+    "el.hasAttribute('disabled') || el.getAttribute('aria-disabled') === 'true'"
+    " || (el.getAttribute('class') || '').toLowerCase().includes('disabled')"
+)
+
+
+@dataclass(frozen=True)
+class Scripts:
+    """
+    Helpers em JS: cada um substitui vários comandos WebDriver
+    (find + get_attribute/.text) por um único execute_script.
+    """
+
+    # arguments[0] = CSS das linhas
+    PAGE_SIGNATURE = (
+        "return Array.from(document.querySelectorAll(arguments[0])).slice(0, 3)"
+        ".map(r => r.innerText).join('\\n');"
+    )
+    # arguments[0] = CSS do tbody
+    TBODY_TEXT = "const t = document.querySelector(arguments[0]); return t ? t.innerText : '';"
+    # arguments[0] = CSS do tbody, arguments[1] = CSS das linhas -> [tbody, primeira linha, assinatura]
+    TABLE_SNAPSHOT = (
+        "const rows = Array.from(document.querySelectorAll(arguments[1]));"
+        "return [document.querySelector(arguments[0]), rows.length ? rows[0] : null,"
+        " rows.slice(0, 3).map(r => r.innerText).join('\\n')];"
+    )
+    # arguments[0] = CSS das linhas, arguments[1] = CSS do container,
+    # arguments[2] = XPath do empty-state -> 'rows' | 'empty' | null (ainda carregando)
+    # Só conta empty-state renderizado: texto de <script>/JSON embutido ou de
+    # nós escondidos (offsetParent null, sem caixas) não encerra um loading.
+    RESULTS_STATE = (
+        "if (document.querySelector(arguments[0])) return 'rows';"
+        "const scope = document.querySelector(arguments[1]) || document.body;"
+        "if (!scope) return null;"
+        "const hits = document.evaluate(arguments[2], scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);"
+        "for (let i = 0; i < hits.snapshotLength; i++) {"
+        " const el = hits.snapshotItem(i);"
+        " if (el.offsetParent !== null || el.getClientRects().length) return 'empty';"
+        "}"
+        "return null;"
+    )
+    # arguments[0] = CSS do container -> "4,567" (de "1-25 of 4,567 results") | null
+    RESULTS_TOTAL = (
+        "const scope = document.querySelector(arguments[0]) || document.body;"
+        "const m = (scope ? scope.textContent : '').match(/of\\s+([\\d,]+)\\s+results/i);"
+        "return m ? m[1] : null;"
+    )
+    # arguments[0] = CSS do botão -> null | [botão, desabilitado?]
+    BUTTON_STATE = (
+        "const el = document.querySelector(arguments[0]);"
+        f"return el ? [el, {_JS_IS_DISABLED}] : null;"
+    )
+
+
 class YahooScreenerPage:
     URL = "https://finance.yahoo.com/research-hub/screener/equity/"
 
     def __init__(self, client, debug: bool = True):
         self.client = client
         self.wait = client.wait  # WebDriverWait padrão do client
+        # timeouts/polling aprendidos por operação (opt-in via client); None = prazos fixos
+        self.waits: Optional[WaitScheduler] = getattr(client, "wait_scheduler", None)
         self.debug = debug
+        self.last_open_seconds: Optional[float] = None
+        # filtros aplicados por este page object: {"Region": "Brazil", "Sector": ...}
+        self.applied_filters: dict = {}
+        # elementos estáveis (botões de filtro/rows-per-page) reaproveitados até ficarem stale
+        self._element_cache: dict = {}
 
     # ------------------ logs ------------------
 
@@ -90,20 +168,76 @@ class YahooScreenerPage:
     # ------------------ public ------------------
 
     def open(self) -> None:
+        t0 = time.perf_counter()
+        warm = getattr(self.client, "warm_profile", False)
         self.client.open(self.URL)
         self._accept_cookies_if_present()
         self._wait_results_present_or_empty()        
+        # consentimento resolvido e tabela carregada: só agora o perfil conta como quente
+        mark_warm = getattr(self.client, "mark_warm", None)
+        if mark_warm:
+            mark_warm()
         self.try_set_rows_per_page(100)
-        self._log("open(): página pronta (linhas ou empty-state).")
+        self.last_open_seconds = time.perf_counter() - t0
+        self._log(
+            f"open(): página pronta (linhas ou empty-state) em {self.last_open_seconds:.2f}s",
+            "(perfil quente)" if warm else "",
+        )
 
     def apply_region(self, region: str) -> None:
-        target_norm = region.strip().lower()
-        self._log(f"apply_region('{region}') target_norm='{target_norm}'")
+        self.apply_filter("Region", region)
+
+    def apply_filter(self, name: str, value: str) -> None:
+        """Deixa SOMENTE `value` marcado no dropdown de filtro `name` (Region, Sector, ...)."""
+        target_norm = value.strip().lower()
+        self._log(f"apply_filter('{name}', '{value}') target_norm='{target_norm}'")
+
+        self._apply_filter_dialog(name, lambda dialog: self._ensure_only_target_checked(dialog, target_norm, name))
+        self.applied_filters[name] = value
 
+    def clear_filter(self, name: str) -> None:
+        """Desmarca todas as opções do filtro `name`."""
+        self._log(f"clear_filter('{name}')")
+        self._apply_filter_dialog(name, self._uncheck_all)
+        self.applied_filters.pop(name, None)
+
+    def set_filters(self, filters: dict) -> None:
+        """
+        Leva a tela ao conjunto exato de filtros {nome: valor}, mexendo só
+        nos dropdowns que mudaram em relação ao estado atual.
+        """
+        for name in list(self.applied_filters):
+            if name not in filters:
+                self.clear_filter(name)
+        for name, value in filters.items():
+            if self.applied_filters.get(name) != value:
+                self.apply_filter(name, value)
+
+    def get_result_count(self) -> Optional[int]:
+        """Total de resultados do filtro atual ("1-25 of 4,567 results"), se visível."""
+        try:
+            txt = self.client.driver.execute_script(Scripts.RESULTS_TOTAL, Locators.SCREENER_CONTAINER[1])
+        except Exception:
+            return None
+        if not txt:
+            return None
+        try:
+            return int(str(txt).replace(",", ""))
+        except ValueError:
+            return None
+
+    def _apply_filter_dialog(self, name: str, toggle) -> None:
+        before_hash = self._tbody_hash()
         tbody_before, first_row_before, sig_before = self._table_snapshot()
         self._log("Snapshot antes:", {"has_tbody": bool(tbody_before), "has_row": bool(first_row_before)})
 
-        btn = self.wait.until(EC.presence_of_element_located(Locators.REGION_MENU_BUTTON))
+        btn = self.wait.until(
+            lambda d: self._cached(
+                f"filter_menu:{name}",
+                Locators.filter_menu_button_css(name),
+                Locators.filter_menu_button(name),
+            )
+        )
         self._scroll_into_view(btn)
 
         dialog = self._open_region_dialog(btn)
@@ -111,18 +245,29 @@ class YahooScreenerPage:
         before_checked = self._get_checked_regions(dialog)
         self._log("Checked BEFORE:", before_checked)
 
-        self._ensure_only_target_checked(dialog, target_norm)
+        toggle(dialog)
 
         after_checked = self._get_checked_regions(dialog)
         self._log("Checked AFTER:", after_checked)
 
-        clicked_apply = self._click_apply_if_enabled(dialog)
+        # seleção igual à de antes: Apply nunca habilita, não vale esperar por ele
+        changed = after_checked != before_checked
+        clicked_apply = changed and self._click_apply_if_enabled(dialog)
         self._log("Apply clicked?", clicked_apply)
+        if not clicked_apply:
+            # sem Apply o popover segue aberto; fecha pelo próprio botão
+            self._safe_click(btn)
+            self._wait_dialog_closed(dialog)
+            if changed:
+                # a seleção mudou mas não foi aplicada: a tela segue com o filtro antigo
+                raise RuntimeError(f"Apply não habilitou no filtro '{name}'; filtro não aplicado.")
+            # nada mudou (filtro já era esse): a tabela não muda, não adianta esperar refresh
+            return
 
         self._wait_dialog_closed(dialog)
 
         # wait otimizado: primeiro tenta hash de tbody, depois fallback
-        self._wait_table_refresh_fast(tbody_before, first_row_before, sig_before)
+        self._wait_table_refresh_fast(before_hash, tbody_before, first_row_before, sig_before, op="apply_filter")
 
         sig_after = self._page_signature()
         self._log("Signature AFTER:", sig_after[:200].replace("\n", " | "))
@@ -142,16 +287,19 @@ class YahooScreenerPage:
         self._wait_results_present_or_empty()
         self._goto_first_page_if_possible()
 
+        stats = getattr(self.client, "command_stats", None)
+        mark = stats.total if stats else 0
+
         page_num = 1
         while page_num <= max_pages:
             self._wait_results_present_or_empty()
             yield self.get_table_html()
 
-            next_btn = self._find(Locators.NEXT_PAGE)
+            next_btn, next_disabled = self._pager_button(Locators.NEXT_PAGE)
             if not next_btn:
                 self._log("iter_pages_table_html(): botão Next não encontrado. Stop.")
                 break
-            if self._is_disabled(next_btn):
+            if next_disabled:
                 self._log("iter_pages_table_html(): Next desabilitado (última página). Stop.")
                 break
 
@@ -163,9 +311,13 @@ class YahooScreenerPage:
             self._safe_click(next_btn)
 
             # espera rápida via hash; fallback se falhar
-            if not self._wait_table_changed_fast(before_hash, timeout=15, poll=0.2):
-                self._log("hash não mudou em 15s; usando refresh robusto (staleness/signature)...")
-                self._wait_table_refresh(tbody_before, first_row_before, sig_before)
+            if not self._wait_table_changed_fast(before_hash, timeout=15, poll=0.2, op="next_page"):
+                self._log("hash não mudou no prazo; usando refresh robusto (staleness/signature)...")
+                self._wait_table_refresh(tbody_before, first_row_before, sig_before, op="next_page")
+
+            if stats:
+                self._log(f"página {page_num}: {stats.total - mark} comandos WebDriver")
+                mark = stats.total
 
             page_num += 1
 
@@ -178,7 +330,7 @@ class YahooScreenerPage:
         """
         desired = str(value).strip()
         try:
-            btn = self._find(Locators.ROWS_PER_PAGE_BUTTON)
+            btn = self._cached("rows_per_page", Locators.ROWS_PER_PAGE_BUTTON)
             if not btn:
                 self._log("Rows-per-page: controle não encontrado (ok).")
                 return False
@@ -223,12 +375,12 @@ class YahooScreenerPage:
             self._safe_click(option)
 
             # após trocar rows/page, a tabela deve atualizar
-            if not self._wait_table_changed_fast(before_hash, timeout=15, poll=0.2):
+            if not self._wait_table_changed_fast(before_hash, timeout=15, poll=0.2, op="rows_per_page"):
                 self._log("Rows-per-page: hash não mudou; aguardando linhas/empty como fallback...")
                 self._wait_results_present_or_empty()
 
             # conferir de novo o aria-label/title
-            btn2 = self._find(Locators.ROWS_PER_PAGE_BUTTON)
+            btn2 = self._cached("rows_per_page", Locators.ROWS_PER_PAGE_BUTTON)
             now = (btn2.get_attribute("aria-label") or btn2.get_attribute("title") or "").strip() if btn2 else ""
             ok = (now == desired)
             self._log("Rows-per-page: result =", {"ok": ok, "now": now})
@@ -244,6 +396,14 @@ class YahooScreenerPage:
     # ------------------ cookies ------------------
 
     def _accept_cookies_if_present(self) -> None:
+        # perfil quente já tem o cookie de consentimento: só uma checagem sem espera
+        if getattr(self.client, "warm_profile", False):
+            btn = self._find(Locators.COOKIE_ACCEPT)
+            if btn:
+                self._log("Cookie/consent detectado (perfil quente). Clicando...")
+                self._safe_click(btn)
+            return
+
         try:
             btn = self._wait_short(2).until(EC.element_to_be_clickable(Locators.COOKIE_ACCEPT))
             self._log("Cookie/consent detectado. Clicando...")
@@ -255,7 +415,7 @@ class YahooScreenerPage:
 
     def _open_region_dialog(self, region_button):
         """
-        Abre o dropdown do Region e retorna o dialog_root real,
+        Abre o dropdown de um filtro (Region, Sector, ...) e retorna o dialog_root real,
         sem depender de aria-controls.
         """
 
@@ -275,7 +435,7 @@ class YahooScreenerPage:
         before_open = list_open_dialogs()
         self._log("Dialogs abertos ANTES:", len(before_open))
 
-        self._log("Abrindo popover Region (click)...")
+        self._log("Abrindo popover do filtro (click)...")
         self._safe_click(region_button)
 
         def wait_open_dialog(_):
@@ -347,12 +507,12 @@ class YahooScreenerPage:
         except Exception:
             return None
 
-    def _ensure_only_target_checked(self, dialog_root, target_norm: str) -> None:
+    def _ensure_only_target_checked(self, dialog_root, target_norm: str, filter_name: str = "Region") -> None:
         self._log("Toggle: deixando SOMENTE marcado:", target_norm)
 
         target_label = self._find_label_by_name(dialog_root, target_norm)
         if target_label is None:
-            raise RuntimeError(f"Região alvo '{target_norm}' não encontrada na lista.")
+            raise RuntimeError(f"Opção '{target_norm}' não encontrada no filtro '{filter_name}'.")
 
         def target_selected() -> bool:
             return target_label.find_element(By.XPATH, ".//input[@type='checkbox']").is_selected()
@@ -379,6 +539,17 @@ class YahooScreenerPage:
         final_checked = self._get_checked_regions(dialog_root)
         self._log("Marcados FINAL:", final_checked)
 
+    def _uncheck_all(self, dialog_root) -> None:
+        for label in self._get_option_labels(dialog_root):
+            try:
+                name = label.find_element(By.XPATH, ".//span").text.strip()
+                cb = label.find_element(By.XPATH, ".//input[@type='checkbox']")
+            except Exception:
+                continue
+            if cb.is_selected():
+                self._log("Desmarcando:", name)
+                self._safe_click(label)
+
     # ------------------ Apply ------------------
 
     def _click_apply_if_enabled(self, dialog_root) -> bool:
@@ -405,42 +576,74 @@ class YahooScreenerPage:
         Mais confiável que staleness quando o Yahoo só troca texto/linhas sem recriar nós.
         """
         try:
-            tbody = self.client.driver.find_element(*Locators.TBODY)
-            txt = (tbody.text or "").strip()
-            if not txt:
-                return ""
-            return hashlib.md5(txt.encode("utf-8")).hexdigest()
+            txt = self.client.driver.execute_script(Scripts.TBODY_TEXT, Locators.TBODY[1])
         except Exception:
+            try:
+                tbody = self.client.driver.find_element(*Locators.TBODY)
+                txt = tbody.text
+            except Exception:
+                return ""
+        txt = (txt or "").strip()
+        if not txt:
             return ""
+        return hashlib.md5(txt.encode("utf-8")).hexdigest()
 
-    def _wait_table_changed_fast(self, before_hash: str, timeout: int = 15, poll: float = 0.2) -> bool:
+    def _wait_table_changed_fast(
+        self, before_hash: str, timeout: float = 15, poll: float = 0.2, op: str = "refresh"
+    ) -> bool:
         """
         Polling curto (sem WebDriverWait pesado) esperando hash mudar.
+        tbody vazio só conta como mudança se o empty-state já estiver visível
+        (senão é só a tabela sendo recarregada).
+
+        timeout/poll são os valores fixos de fallback; com histórico suficiente
+        o WaitScheduler os ajusta pela latência observada da operação `op`.
+        Timeout também entra como amostra (no valor do prazo), senão o p99
+        aprendido só poderia encolher.
         """
-        end = time.time() + timeout
-        while time.time() < end:
+        timeout = self._adaptive_timeout(op, timeout)
+        poll = self._adaptive_poll(op, poll)
+
+        start = time.monotonic()
+        end = start + timeout
+        while time.monotonic() < end:
             now = self._tbody_hash()
-            if now and now != before_hash:
+            if now != before_hash and (now or self._results_state() == "empty"):
+                self._record_wait(op, time.monotonic() - start)
                 return True
             time.sleep(poll)
+        self._record_wait(op, timeout)
+        self._log(f"{op}: tabela não mudou em {timeout:.1f}s (poll {poll:.2f}s).")
         return False
 
-    def _wait_table_refresh_fast(self, tbody_before, first_row_before, sig_before: str) -> None:
+    def _wait_table_refresh_fast(
+        self, before_hash: str, tbody_before, first_row_before, sig_before: str, op: str = "refresh"
+    ) -> None:
         """
         Versão otimizada: tenta hash primeiro, depois cai no refresh robusto antigo.
+        before_hash precisa ser lido ANTES da ação (se a tabela re-renderizar
+        rápido, um hash lido depois já seria o novo e o wait nunca terminaria).
         """
-        before_hash = self._tbody_hash()
         # se o hash existe, tenta rápido (evita 25-30s sempre)
         if before_hash:
-            if self._wait_table_changed_fast(before_hash, timeout=15, poll=0.2):
+            if self._wait_table_changed_fast(before_hash, timeout=15, poll=0.2, op=op):
                 self._wait_results_present_or_empty()
                 self._log("Refresh (fast-hash) concluído.")
                 return
 
         # fallback robusto
-        self._wait_table_refresh(tbody_before, first_row_before, sig_before)
+        self._wait_table_refresh(tbody_before, first_row_before, sig_before, op=op)
 
     def _table_snapshot(self) -> Tuple[Optional[object], Optional[object], str]:
+        try:
+            tbody_el, row_el, sig = self.client.driver.execute_script(
+                Scripts.TABLE_SNAPSHOT, Locators.TBODY[1], Locators.TABLE_ROWS[1]
+            )
+            return tbody_el, row_el, sig or ""
+        except Exception:
+            pass
+
+        # fallback: comandos separados
         tbody_el = None
         row_el = None
         try:
@@ -452,54 +655,78 @@ class YahooScreenerPage:
             row_el = rows[0] if rows else None
         except Exception:
             row_el = None
-        return tbody_el, row_el, self._page_signature()
+        return tbody_el, row_el, self._page_signature_slow()
 
-    def _wait_table_refresh(self, tbody_before, first_row_before, sig_before: str) -> None:
+    def _wait_table_refresh(self, tbody_before, first_row_before, sig_before: str, op: str = "refresh") -> None:
         """
         Fallback robusto (igual o seu), para quando hash/staleness não dão sinal.
+        É o recovery de um wait rápido que estourou: os prazos (25s/25s/20s)
+        ficam fixos, só o polling acompanha a latência de `op`.
         """
         self._log("Aguardando refresh da tabela...")
+        poll = self._adaptive_poll(op, 0.5)
 
         if tbody_before is not None:
             try:
-                self._wait_short(25).until(EC.staleness_of(tbody_before))
+                self._wait_short(25, poll).until(EC.staleness_of(tbody_before))
                 self._log("tbody stale (re-render).")
                 self._wait_results_present_or_empty()
                 return
             except TimeoutException:
-                self._log("staleness(tbody) não ocorreu em 25s.")
+                self._log("staleness(tbody) não ocorreu no prazo.")
 
         if first_row_before is not None:
             try:
-                self._wait_short(25).until(EC.staleness_of(first_row_before))
+                self._wait_short(25, poll).until(EC.staleness_of(first_row_before))
                 self._log("first_row stale (re-render).")
                 self._wait_results_present_or_empty()
                 return
             except TimeoutException:
-                self._log("staleness(first_row) não ocorreu em 25s.")
+                self._log("staleness(first_row) não ocorreu no prazo.")
 
         try:
-            self._wait_short(20).until(lambda d: self._page_signature() != sig_before)
+            self._wait_short(20, poll).until(lambda d: self._page_signature() != sig_before)
             self._log("assinatura mudou.")
         except TimeoutException:
-            self._log("assinatura não mudou em 20s (pode ser mesmo dataset/ordem).")
+            self._log("assinatura não mudou no prazo (pode ser mesmo dataset/ordem).")
 
         self._wait_results_present_or_empty()
         self._log("Refresh concluído (linhas ou empty).")
 
     def _wait_results_present_or_empty(self) -> None:
-        self.wait.until(
-            lambda d: (len(d.find_elements(*Locators.TABLE_ROWS)) > 0)
-            or (len(d.find_elements(*Locators.EMPTY_STATE)) > 0)
-        )
+        # prazo fixo: na maioria das chamadas a tabela já está lá (retorno
+        # instantâneo), então uma latência aprendida daqui derrubaria o prazo
+        # justamente do carregamento lento
+        self._wait_short(10).until(lambda d: self._results_state() is not None)
+
+    def _results_state(self) -> Optional[str]:
+        """
+        'rows', 'empty' ou None (ainda carregando), em um único round trip:
+        primeiro a checagem CSS das linhas, depois o empty-state visível no container.
+        """
+        try:
+            return self.client.driver.execute_script(
+                Scripts.RESULTS_STATE, Locators.TABLE_ROWS[1], Locators.SCREENER_CONTAINER[1], Locators.EMPTY_STATE[1]
+            )
+        except Exception:
+            pass
+
+        # fallback: comandos separados, ainda com a busca de empty-state escopada
+        driver = self.client.driver
+        if driver.find_elements(*Locators.TABLE_ROWS):
+            return "rows"
+        scope = self._find(Locators.SCREENER_CONTAINER) or self._find(Locators.BODY)
+        if scope is not None and any(self._is_displayed(el) for el in scope.find_elements(*Locators.EMPTY_STATE)):
+            return "empty"
+        return None
 
     # ------------------ pager: first page ------------------
 
     def _goto_first_page_if_possible(self) -> None:
-        btn = self._find(Locators.FIRST_PAGE)
+        btn, disabled = self._pager_button(Locators.FIRST_PAGE)
         if not btn:
             return
-        if self._is_disabled(btn):
+        if disabled:
             self._log("First-page já desabilitado (já estamos na primeira).")
             return
 
@@ -510,8 +737,8 @@ class YahooScreenerPage:
         self._scroll_into_view(btn)
         self._safe_click(btn)
 
-        if not self._wait_table_changed_fast(before_hash, timeout=15, poll=0.2):
-            self._wait_table_refresh(tbody_before, first_row_before, sig_before)
+        if not self._wait_table_changed_fast(before_hash, timeout=15, poll=0.2, op="first_page"):
+            self._wait_table_refresh(tbody_before, first_row_before, sig_before, op="first_page")
 
     # ------------------ misc helpers ------------------
 
@@ -522,10 +749,53 @@ class YahooScreenerPage:
         except Exception:
             return None
 
+    def _cached(self, name: str, *locators):
+        """
+        Elemento estável com cache: revalida com um comando barato (sem varrer
+        o DOM) e só procura de novo quando ficou stale. Os locators são tentados
+        em ordem (do mais barato para o mais caro).
+        """
+        el = self._element_cache.get(name)
+        if el is not None:
+            try:
+                el.is_enabled()
+                return el
+            except Exception:  # StaleElementReferenceException e afins
+                self._element_cache.pop(name, None)
+
+        for locator in locators:
+            el = self._find(locator)
+            if el is not None:
+                self._element_cache[name] = el
+                return el
+        return None
+
+    def _pager_button(self, locator) -> Tuple[Optional[object], bool]:
+        """Botão do pager + estado desabilitado em um único round trip."""
+        try:
+            state = self.client.driver.execute_script(Scripts.BUTTON_STATE, locator[1])
+            return (state[0], bool(state[1])) if state else (None, False)
+        except Exception:
+            btn = self._find(locator)
+            return btn, (self._is_disabled(btn) if btn else False)
+
     def _page_signature(self) -> str:
+        try:
+            return self.client.driver.execute_script(Scripts.PAGE_SIGNATURE, Locators.TABLE_ROWS[1]) or ""
+        except Exception:
+            return self._page_signature_slow()
+
+    def _page_signature_slow(self) -> str:
         rows = self.client.driver.find_elements(*Locators.TABLE_ROWS)[:3]
         return "\n".join(r.text for r in rows)
 
+    @staticmethod
+    def _is_displayed(el) -> bool:
+        try:
+            return el.is_displayed()
+        except StaleElementReferenceException:
+            return False
+
     @staticmethod
     def _is_disabled(el) -> bool:
         disabled_attr = el.get_attribute("disabled")
@@ -545,6 +815,18 @@ class YahooScreenerPage:
         except Exception:
             return
 
-    def _wait_short(self, seconds: int) -> WebDriverWait:
-        # cria um wait com o mesmo driver e timeout menor
-        return self.wait.__class__(self.client.driver, seconds)
+    def _adaptive_timeout(self, op: str, default: float) -> float:
+        return self.waits.timeout(op, default) if self.waits else default
+
+    def _adaptive_poll(self, op: str, default: float) -> float:
+        return self.waits.poll(op, default) if self.waits else default
+
+    def _record_wait(self, op: str, seconds: float) -> None:
+        if self.waits:
+            self.waits.record(op, seconds)
+
+    def _wait_short(self, seconds: float, poll: Optional[float] = None) -> WebDriverWait:
+        # cria um wait com o mesmo driver e timeout menor (e polling próprio, se dado)
+        if poll is None:
+            return self.wait.__class__(self.client.driver, seconds)
+        return self.wait.__class__(self.client.driver, seconds, poll_frequency=poll)
@@ -0,0 +1,164 @@
+import sqlite3
+import time
+from typing import Iterable, Optional
+
+
+class PriceStore:
+    """
+    Histórico local de preços (SQLite embutido).
+
+    Cada execução do crawler vira um "run"; as linhas de cada página são
+    gravadas em lote dentro de uma transação. Os índices em (symbol, ts) e
+    (region, ts) permitem consultar histórico/snapshot sem reler CSVs antigos.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            region      TEXT NOT NULL,
+            started_at  REAL NOT NULL,
+            finished_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS prices (
+            run_id  INTEGER NOT NULL REFERENCES runs(id),
+            ts      REAL NOT NULL,
+            region  TEXT NOT NULL,
+            symbol  TEXT NOT NULL,
+            name    TEXT,
+            price   REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_prices_symbol_ts ON prices(symbol, ts);
+        CREATE INDEX IF NOT EXISTS idx_prices_region_ts ON prices(region, ts);
+        CREATE INDEX IF NOT EXISTS idx_prices_run_symbol ON prices(run_id, symbol);
+        CREATE INDEX IF NOT EXISTS idx_runs_region ON runs(region, id);
+    """
+
+    def __init__(self, path: str = "prices.db"):
+        self.path = path
+        # check_same_thread=False: workers do run_sharded gravam (serializados por lock)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        # WAL: leitores (CLI de consulta) não bloqueiam o crawler escrevendo
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    # ------------------ escrita ------------------
+
+    def begin_run(self, region: str) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (region, started_at) VALUES (?, ?)",
+                (self._norm_region(region), time.time()),
+            )
+        return cur.lastrowid
+
+    def finish_run(self, run_id: int) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id))
+
+    def ingest(self, run_id: int, region: str, rows: Iterable[dict], ts: Optional[float] = None) -> int:
+        """Grava as linhas de uma página em uma única transação."""
+        ts = time.time() if ts is None else ts
+        region = self._norm_region(region)
+        records = [
+            (run_id, ts, region, (r.get("symbol") or "").strip(), r.get("name"), self.parse_price(r.get("price")))
+            for r in rows
+        ]
+        records = [rec for rec in records if rec[3]]
+        if not records:
+            return 0
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO prices (run_id, ts, region, symbol, name, price) VALUES (?, ?, ?, ?, ?, ?)",
+                records,
+            )
+        return len(records)
+
+    # ------------------ consultas ------------------
+
+    def latest_run_ids(self, region: str, n: int = 1, include_unfinished: bool = False) -> list[int]:
+        """
+        Runs mais recentes da região. Por padrão só os concluídos: um crawl que
+        caiu ou um stream cortado (ex.: "| head") deixa um run parcial.
+        """
+        sql = "SELECT id FROM runs WHERE region = ?"
+        if not include_unfinished:
+            sql += " AND finished_at IS NOT NULL"
+        sql += " ORDER BY id DESC LIMIT ?"
+        cur = self.conn.execute(sql, (self._norm_region(region), n))
+        return [row["id"] for row in cur]
+
+    def latest_snapshot(self, region: str, include_unfinished: bool = False) -> list[dict]:
+        """Linhas do run (concluído) mais recente da região."""
+        ids = self.latest_run_ids(region, 1, include_unfinished)
+        if not ids:
+            return []
+        cur = self.conn.execute(
+            "SELECT symbol, name, price, ts FROM prices WHERE run_id = ? ORDER BY symbol",
+            (ids[0],),
+        )
+        return [dict(row) for row in cur]
+
+    def history(self, symbol: str, since: Optional[float] = None) -> list[dict]:
+        """Série de preços de um símbolo (usa o índice (symbol, ts))."""
+        sql = "SELECT ts, run_id, region, price FROM prices WHERE symbol = ?"
+        params: list = [symbol.strip()]
+        if since is not None:
+            sql += " AND ts >= ?"
+            params.append(since)
+        sql += " ORDER BY ts"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def top_movers(
+        self,
+        region: str,
+        limit: int = 10,
+        run_from: Optional[int] = None,
+        run_to: Optional[int] = None,
+        include_unfinished: bool = False,
+    ) -> list[dict]:
+        """
+        Maiores variações percentuais entre dois runs.
+        Sem runs explícitos, compara os dois mais recentes (concluídos) da região.
+        """
+        if run_from is None or run_to is None:
+            ids = self.latest_run_ids(region, 2, include_unfinished)
+            if len(ids) < 2:
+                return []
+            run_to, run_from = ids[0], ids[1]
+
+        cur = self.conn.execute(
+            """
+            SELECT b.symbol AS symbol, b.name AS name,
+                   a.price AS price_from, b.price AS price_to,
+                   (b.price - a.price) / a.price * 100.0 AS change_pct
+            FROM prices b
+            JOIN prices a ON a.run_id = ? AND a.symbol = b.symbol
+            WHERE b.run_id = ? AND a.price > 0 AND b.price IS NOT NULL
+            ORDER BY ABS(change_pct) DESC
+            LIMIT ?
+            """,
+            (run_from, run_to, limit),
+        )
+        return [dict(row) for row in cur]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ------------------ helpers ------------------
+
+    @staticmethod
+    def parse_price(value) -> Optional[float]:
+        """'1,234.56' -> 1234.56; vazio/'-'/inválido -> None."""
+        txt = (str(value) if value is not None else "").replace(",", "").strip()
+        if not txt:
+            return None
+        try:
+            return float(txt)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _norm_region(region: str) -> str:
+        return region.strip().lower()
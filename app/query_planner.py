@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+# Opções dos dropdowns do screener usados para fatiar uma região grande
+SECTORS = (
+    "Basic Materials",
+    "Communication Services",
+    "Consumer Cyclical",
+    "Consumer Defensive",
+    "Energy",
+    "Financial Services",
+    "Healthcare",
+    "Industrials",
+    "Real Estate",
+    "Technology",
+    "Utilities",
+)
+MARKET_CAP_BANDS = ("Small Cap", "Mid Cap", "Large Cap", "Mega Cap")
+
+DEFAULT_DIMENSIONS = (
+    ("Sector", SECTORS),
+    ("Market Cap (Intraday)", MARKET_CAP_BANDS),
+)
+
+
+@dataclass(frozen=True)
+class Slice:
+    """Uma fatia disjunta da consulta: Region + no máximo uma opção por filtro extra."""
+
+    filters: tuple  # (("Region", "United States"), ("Sector", "Energy"), ...)
+    estimate: Optional[int] = None
+    # estimativa acima de max_slice_rows sem dimensão restante para dividir:
+    # a paginação do screener pode não alcançar todas as linhas
+    oversized: bool = False
+
+    @property
+    def as_dict(self) -> dict:
+        return dict(self.filters)
+
+    @property
+    def label(self) -> str:
+        return " / ".join(v for _, v in self.filters)
+
+    def with_filter(self, name: str, value: str) -> "Slice":
+        return Slice(self.filters + ((name, value),))
+
+
+@dataclass
+class ShardReport:
+    region: str
+    expected: Optional[int]  # total da consulta sem fatiar
+    collected: int = 0
+    slices: list = field(default_factory=list)
+
+    @property
+    def missing(self) -> Optional[int]:
+        return None if self.expected is None else max(0, self.expected - self.collected)
+
+    @property
+    def complete(self) -> bool:
+        return self.missing == 0
+
+    @property
+    def oversized(self) -> list:
+        return [s for s in self.slices if s.oversized]
+
+
+class QueryPlanner:
+    """
+    Divide uma região em fatias disjuntas (Region x Sector x Market Cap ...).
+
+    Cada fatia é estimada pelo total de resultados do screener; fatias maiores
+    que max_slice_rows são re-divididas pela próxima dimensão. Fatias sem
+    estimativa (contador não visível) ficam como estão; as que continuam
+    grandes sem dimensão restante são marcadas como `oversized`.
+    """
+
+    def __init__(
+        self,
+        estimate: Callable[[Slice], Optional[int]],
+        dimensions: Sequence = DEFAULT_DIMENSIONS,
+        max_slice_rows: int = 5_000,
+        debug: bool = False,
+    ):
+        self.estimate = estimate
+        self.dimensions = tuple(dimensions)
+        self.max_slice_rows = max_slice_rows
+        self.debug = debug
+
+    def _log(self, *args):
+        if self.debug:
+            print("[QueryPlanner]", *args, flush=True)
+
+    def plan(self, region: str) -> tuple[Optional[int], list[Slice]]:
+        """Retorna (total sem fatiar, fatias planejadas)."""
+        root = Slice((("Region", region),))
+        total = self.estimate(root)
+        if total is not None and total <= self.max_slice_rows:
+            return total, [Slice(root.filters, total)]
+        if not self.dimensions:
+            return total, [self._leaf(root, total)]
+        return total, self._split(root, 0)
+
+    def _leaf(self, slice_: Slice, est: Optional[int]) -> Slice:
+        oversized = est is not None and est > self.max_slice_rows
+        if oversized:
+            self._log(f"fatia '{slice_.label}' com {est} linhas > {self.max_slice_rows} e sem dimensão para dividir")
+        return Slice(slice_.filters, est, oversized)
+
+    def _split(self, parent: Slice, depth: int) -> list[Slice]:
+        name, values = self.dimensions[depth]
+        planned: list[Slice] = []
+        for value in values:
+            child = parent.with_filter(name, value)
+            est = self.estimate(child)
+            if est == 0:
+                continue
+            if est is not None and est > self.max_slice_rows and depth + 1 < len(self.dimensions):
+                planned.extend(self._split(child, depth + 1))
+            else:
+                planned.append(self._leaf(child, est))
+        return planned
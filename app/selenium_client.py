@@ -1,9 +1,22 @@
+from typing import Optional
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 
+from app.browser_profile import BrowserProfile
+from app.driver_metrics import CommandStats, instrument_driver
+from app.wait_scheduler import WaitScheduler
+
 class SeleniumClient:
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: bool = True,
+        profile: Optional[BrowserProfile] = None,
+        worker: int = 0,
+        track_commands: bool = False,
+        wait_scheduler: Optional[WaitScheduler] = None,
+    ):
         options = Options()
 
         if headless:
@@ -22,12 +35,33 @@ class SeleniumClient:
         # Opcional: evita detecção simples de automação
         options.add_argument("--disable-blink-features=AutomationControlled")
 
+        # Perfil persistente: reaproveita cookies de consentimento e cache HTTP
+        self.profile = profile
+        self.worker = worker
+        self.warm_profile = False
+        if profile is not None:
+            user_data_dir = profile.prepare(worker)
+            self.warm_profile = profile.is_warm(worker)
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+
         self.driver = webdriver.Chrome(options=options)
         self.wait = WebDriverWait(self.driver, 10)
 
+        # contagem de round trips por call site (diagnóstico)
+        self.command_stats: Optional[CommandStats] = instrument_driver(self.driver) if track_commands else None
+
+        # latências aprendidas dos waits; lido pelo page object
+        self.wait_scheduler = wait_scheduler
+
     def open(self, url: str):
         self.driver.get(url)
 
+    def mark_warm(self) -> None:
+        """Chamado pelo page object após um open() completo: o perfil passa a ser quente."""
+        if self.profile is not None:
+            self.profile.mark_warm(self.worker)
+            self.warm_profile = True
+
     def get_page_source(self) -> str:
         return self.driver.page_source
 
@@ -0,0 +1,274 @@
+import hashlib
+import os
+import sqlite3
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+from typing import Iterable, Optional
+
+# Marcadores de listagem derivada: o nome do emissor vem antes deles
+# ("NVIDIA CORP CEDEAR EACH 24 REP" -> "NVIDIA CORP")
+_LISTING_MARKERS = {"CEDEAR", "BDR", "BDRS", "ADR", "ADRS", "GDR", "DRN", "EACH", "REP"}
+
+# Sufixos societários removidos do fim do nome
+_CORPORATE_SUFFIXES = {
+    "AG", "CO", "COMPANY", "CORP", "CORPORATION", "INC", "INCORPORATED", "LIMITED",
+    "LLC", "LP", "LTD", "NV", "PLC", "SA", "SAB", "SE", "SPA",
+}
+
+
+def issuer_key(name: str) -> str:
+    """
+    Nome normalizado do emissor, para ligar listagens cruzadas ao mesmo papel.
+
+    'NVIDIA Corporation', 'NVIDIA CORP CEDEAR EACH 24 REP' -> 'NVIDIA'
+    'Vale S.A.' -> 'VALE'; nome vazio/'--' -> ''.
+    """
+    txt = unicodedata.normalize("NFKD", name or "")
+    txt = "".join(c for c in txt if not unicodedata.combining(c)).upper().replace(".", "")
+    tokens = "".join(c if c.isalnum() else " " for c in txt).split()
+
+    for i, tok in enumerate(tokens):
+        if tok in _LISTING_MARKERS:
+            tokens = tokens[:i]
+            break
+
+    while len(tokens) > 1 and tokens[-1] in _CORPORATE_SUFFIXES:
+        tokens.pop()
+
+    return " ".join(tokens)
+
+
+def key_hash(key: str) -> int:
+    """Hash de 64 bits (com sinal, cabe em array('q') e em INTEGER do SQLite)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+
+class SymbolIndex:
+    """
+    Conjunto compacto de chaves já vistas (símbolos ou emissores) + emissor de cada uma.
+
+    As chaves ficam como hashes de 64 bits num array ordenado (busca binária),
+    com o emissor internado num array paralelo: ~12 bytes por chave, contra
+    ~120 bytes de uma str dentro de um set. Inserções vão para um buffer
+    pequeno que é mesclado no array quando passa de 1/4 do tamanho.
+
+    Colisão de hash de 64 bits: ~n²/2^65 (≈3e-8 para 1 milhão de chaves).
+    Não é thread-safe: quem compartilha entre threads serializa (ver run_sharded).
+    """
+
+    MERGE_MIN = 4_096
+
+    def __init__(self):
+        self._keys = array("q")
+        self._issuer_ids = array("I")
+        self._recent: dict[int, int] = {}
+        self._issuers: list[str] = [""]
+        self._issuer_ids_by_name: dict[str, int] = {"": 0}
+
+    def add(self, key: str, issuer: str = "") -> bool:
+        """Registra a chave; True se ainda não tinha sido vista."""
+        h = key_hash(key)
+        if h in self._recent or self._find(h) is not None:
+            return False
+
+        self._recent[h] = self._intern(issuer)
+        if len(self._recent) > max(self.MERGE_MIN, len(self._keys) // 4):
+            self._merge()
+        return True
+
+    def add_many(self, items: Iterable[tuple[str, str]]) -> list[bool]:
+        """(chave, emissor) de uma página -> flags de chave nova."""
+        return [self.add(key, issuer) for key, issuer in items]
+
+    def issuer(self, key: str) -> Optional[str]:
+        h = key_hash(key)
+        if h in self._recent:
+            issuer_id = self._recent[h]
+        else:
+            i = self._find(h)
+            if i is None:
+                return None
+            issuer_id = self._issuer_ids[i]
+        return self._issuers[issuer_id] or None
+
+    def issuer_counts(self) -> Counter:
+        """Quantas chaves (listagens) cada emissor tem."""
+        ids = Counter(self._issuer_ids)
+        ids.update(self._recent.values())
+        return Counter({self._issuers[i]: n for i, n in ids.items() if i})
+
+    @property
+    def nbytes(self) -> int:
+        # aproximado: arrays + buffer (dict de ints)
+        recent = len(self._recent) * 100
+        return self._keys.itemsize * len(self._keys) + self._issuer_ids.itemsize * len(self._issuer_ids) + recent
+
+    def __contains__(self, key: str) -> bool:
+        h = key_hash(key)
+        return h in self._recent or self._find(h) is not None
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._recent)
+
+    # ------------------ helpers ------------------
+
+    def _find(self, h: int) -> Optional[int]:
+        i = bisect_left(self._keys, h)
+        if i < len(self._keys) and self._keys[i] == h:
+            return i
+        return None
+
+    def _intern(self, issuer: str) -> int:
+        issuer_id = self._issuer_ids_by_name.get(issuer)
+        if issuer_id is None:
+            issuer_id = len(self._issuers)
+            self._issuers.append(issuer)
+            self._issuer_ids_by_name[issuer] = issuer_id
+        return issuer_id
+
+    def _merge(self) -> None:
+        pairs = sorted(chain(zip(self._keys, self._issuer_ids), self._recent.items()))
+        self._keys = array("q", (k for k, _ in pairs))
+        self._issuer_ids = array("I", (i for _, i in pairs))
+        self._recent = {}
+
+
+class SharedSymbolIndex:
+    """
+    Índice de chaves compartilhado entre processos (regiões/workers em paralelo).
+
+    Tabela ordenada em disco (SQLite, chave primária (run, hash de 64 bits)).
+    Reivindicar uma chave é um INSERT OR IGNORE: só um processo vence, sem
+    lock nem IPC entre eles, e as chaves de uma página vão numa única
+    transação curta. Um SymbolIndex local na frente guarda as chaves que este
+    processo já sabe estarem tomadas, então duplicatas repetidas não vão ao
+    disco.
+
+    As chaves valem dentro de um run: sem `run`, cada instância abre um run
+    novo (reusar o arquivo no dia seguinte não esconde nada); processos que
+    devem deduplicar entre si passam o mesmo rótulo em `run`.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS index_runs (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            label       TEXT UNIQUE,
+            started_at  REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS run_keys (
+            run_id  INTEGER NOT NULL REFERENCES index_runs(id),
+            key     INTEGER NOT NULL,
+            name    TEXT NOT NULL,
+            issuer  TEXT,
+            PRIMARY KEY (run_id, key)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_run_keys_issuer ON run_keys(run_id, issuer);
+    """
+
+    def __init__(self, path: str = "symbols.db", run: Optional[str] = None, timeout: float = 30.0):
+        self.path = path
+        # check_same_thread=False: workers do run_sharded usam (serializados por lock)
+        self.conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._enable_wal(timeout)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.run_id = self._open_run(run)
+        self._known = SymbolIndex()
+
+    def add(self, key: str, issuer: str = "") -> bool:
+        return self.add_many([(key, issuer)])[0]
+
+    def add_many(self, items: Iterable[tuple[str, str]]) -> list[bool]:
+        items = list(items)
+        flags = [False] * len(items)
+        todo = [(i, key, issuer) for i, (key, issuer) in enumerate(items) if key not in self._known]
+        if todo:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for i, key, issuer in todo:
+                    cur = self.conn.execute(
+                        "INSERT OR IGNORE INTO run_keys (run_id, key, name, issuer) VALUES (?, ?, ?, ?)",
+                        (self.run_id, key_hash(key), key, issuer or None),
+                    )
+                    flags[i] = cur.rowcount == 1
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            for _, key, issuer in todo:
+                self._known.add(key, issuer)
+        return flags
+
+    def issuer(self, key: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT issuer FROM run_keys WHERE run_id = ? AND key = ?", (self.run_id, key_hash(key))
+        ).fetchone()
+        return row[0] if row else None
+
+    def listings(self, issuer: str) -> list[str]:
+        """Chaves (símbolos) ligadas a um emissor, em todas as regiões do run."""
+        cur = self.conn.execute(
+            "SELECT name FROM run_keys WHERE run_id = ? AND issuer = ? ORDER BY name", (self.run_id, issuer)
+        )
+        return [row[0] for row in cur]
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._known:
+            return True
+        row = self.conn.execute(
+            "SELECT 1 FROM run_keys WHERE run_id = ? AND key = ?", (self.run_id, key_hash(key))
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM run_keys WHERE run_id = ?", (self.run_id,)).fetchone()[0]
+
+    def _enable_wal(self, timeout: float) -> None:
+        """
+        Liga o WAL (persistente no arquivo). Com vários processos abrindo o
+        mesmo arquivo ao mesmo tempo, trocar o journal mode (ou abrir o WAL que
+        outro acabou de criar) pode dar SQLITE_BUSY sem passar pelo busy
+        timeout. Só troca se ainda não for WAL e tenta de novo até o timeout.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while True:
+            try:
+                mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+                if mode.lower() != "wal":
+                    self.conn.execute("PRAGMA journal_mode=WAL")
+                return
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e) or time.monotonic() >= deadline:
+                    raise
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    def _open_run(self, label: Optional[str]) -> int:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if label is not None:
+                row = self.conn.execute("SELECT id FROM index_runs WHERE label = ?", (label,)).fetchone()
+                if row:
+                    self.conn.execute("COMMIT")
+                    return row[0]
+            cur = self.conn.execute("INSERT INTO index_runs (label, started_at) VALUES (?, ?)", (label, time.time()))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return cur.lastrowid
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @staticmethod
+    def reset(path: str) -> None:
+        """Apaga o arquivo do índice (todos os runs) e os arquivos do WAL."""
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
@@ -0,0 +1,104 @@
+import json
+import math
+import os
+import threading
+from collections import defaultdict, deque
+from typing import Optional
+
+
+class WaitScheduler:
+    """
+    Timeouts e polling dos waits aprendidos a partir das latências observadas.
+
+    Para cada operação (next_page, apply_filter, rows_per_page, ...) guarda os
+    últimos `window` tempos até a tabela atualizar. Com amostras suficientes:
+
+    - timeout = p99 * headroom, limitado a [min_timeout, timeout fixo antigo]:
+      um wait muito acima do normal desiste cedo e cai no fallback/recovery;
+    - poll = p50 / polls_per_median, limitado a [min_poll, poll fixo antigo]:
+      páginas rápidas não esperam um intervalo inteiro de polling.
+
+    Sem amostras suficientes os valores fixos (defaults) são usados.
+    As estatísticas podem ser persistidas em JSON entre execuções.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        window: int = 200,
+        min_samples: int = 10,
+        percentile: float = 0.99,
+        headroom: float = 3.0,
+        min_timeout: float = 2.0,
+        polls_per_median: int = 4,
+        min_poll: float = 0.02,
+    ):
+        self.path = path
+        self.window = window
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_timeout = min_timeout
+        self.polls_per_median = polls_per_median
+        self.min_poll = min_poll
+
+        self._samples: dict = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            self.load()
+
+    # ------------------ registro ------------------
+
+    def record(self, op: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[op].append(seconds)
+
+    # ------------------ decisões ------------------
+
+    def timeout(self, op: str, default: float) -> float:
+        p = self.quantile(op, self.percentile)
+        if p is None:
+            return default
+        return min(default, max(self.min_timeout, p * self.headroom))
+
+    def poll(self, op: str, default: float) -> float:
+        p50 = self.quantile(op, 0.5)
+        if p50 is None:
+            return default
+        return min(default, max(self.min_poll, p50 / self.polls_per_median))
+
+    def quantile(self, op: str, q: float) -> Optional[float]:
+        """Quantil por nearest-rank; None se ainda não há amostras suficientes."""
+        with self._lock:
+            samples = sorted(self._samples.get(op, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = max(1, math.ceil(q * len(samples)))
+        return samples[rank - 1]
+
+    def stats(self) -> dict:
+        ops = list(self._samples)
+        return {
+            op: {"n": len(self._samples[op]), "p50": self.quantile(op, 0.5), "p99": self.quantile(op, 0.99)}
+            for op in ops
+        }
+
+    # ------------------ persistência ------------------
+
+    def load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            for op, samples in data.items():
+                self._samples[op].extend(float(s) for s in samples)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {op: list(samples) for op, samples in self._samples.items()}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
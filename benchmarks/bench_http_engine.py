@@ -0,0 +1,35 @@
+"""
+Throughput do HttpScreenerEngine contra o stand-in local da API, variando a
+concorrência. A latência simulada por request aproxima a da API real.
+
+Uso:
+    python -m benchmarks.bench_http_engine [--rows 10000] [--latency 0.05]
+"""
+import argparse
+import time
+
+from app.engines.http_engine import HttpScreenerEngine, YahooSession
+from tests.fake_screener_server import COOKIE, CRUMB, FakeScreenerServer, make_quotes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    name, value = COOKIE.split("=", 1)
+    session = YahooSession({name: value}, CRUMB)
+
+    with FakeScreenerServer({"us": make_quotes("us", args.rows)}, latency=args.latency) as server:
+        for concurrency in (1, 4, 8, 16):
+            engine = HttpScreenerEngine(session, base_url=server.base_url, page_size=100, concurrency=concurrency)
+            t0 = time.perf_counter()
+            pages = sum(1 for _ in engine.iter_page_rows("United States"))
+            elapsed = time.perf_counter() - t0
+            engine.close()
+            print(f"concurrency={concurrency:<3} {pages} páginas em {elapsed:.2f}s -> {pages / elapsed:.1f} páginas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Custo de cada locator do page object sobre snapshots de DOM da página inteira.
+
+Os snapshots são HTML salvos de uma sessão real: `--capture ARQUIVO` abre o
+screener no Chrome (YahooScreenerPage.open()) e grava client.get_page_source().
+Sem arquivos, usa os snapshots em benchmarks/snapshots/*.html e, se não houver
+nenhum, um snapshot sintético do FakeWebDriver com nós de "ruído" para chegar
+perto do tamanho do DOM do Yahoo.
+
+Modo padrão (sem browser): todos os locators rodam no mesmo motor (lxml); os
+seletores CSS são traduzidos para XPath com cssselect, então legado x atual é
+uma comparação justa. Com --chrome cada snapshot é aberto no Chrome e os
+locators são medidos no motor real.
+
+Uso:
+    python -m benchmarks.bench_locators --capture benchmarks/snapshots/screener_us.html
+    python -m benchmarks.bench_locators [snapshot.html ...] [--repeat 20] [--chrome]
+"""
+import argparse
+import glob
+import os
+import time
+
+import lxml.etree
+import lxml.html
+from cssselect import HTMLTranslator
+from selenium.webdriver.common.by import By
+
+from app.pages.yahoo_screener_page import Locators
+from tests.fake_webdriver import FakeScreener, FakeWebDriver, make_rows
+
+# locators anteriores (varredura "//" do documento inteiro), para comparação
+LEGACY = {
+    "EMPTY_STATE (legado, //*)": (
+        By.XPATH,
+        "//*[contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'no results') "
+        "or contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'no matching')]",
+    ),
+    "LISTBOX_VISIBLE (legado, XPath)": (
+        By.XPATH,
+        "//*[@role='listbox' and (not(@aria-hidden) or @aria-hidden='false') and not(contains(@class,'tw-hidden'))]",
+    ),
+    "ROWS_PER_PAGE_BUTTON (legado, XPath)": (
+        By.XPATH,
+        "//button[@aria-haspopup='listbox' and contains(@data-ylk,'sec:screener-table') "
+        "and contains(@data-ylk,'subsec:custom-screener')]",
+    ),
+}
+
+CURRENT = {
+    "TABLE_ROWS": Locators.TABLE_ROWS,
+    "EMPTY_STATE (escopado)": Locators.EMPTY_STATE,
+    "REGION_MENU_BUTTON_CSS": Locators.REGION_MENU_BUTTON_CSS,
+    "REGION_MENU_BUTTON (XPath)": Locators.REGION_MENU_BUTTON,
+    "LISTBOX_VISIBLE": Locators.LISTBOX_VISIBLE,
+    "ROWS_PER_PAGE_BUTTON": Locators.ROWS_PER_PAGE_BUTTON,
+    "NEXT_PAGE": Locators.NEXT_PAGE,
+    "DIALOG_CONTAINERS": Locators.DIALOG_CONTAINERS,
+}
+
+# legado -> atual equivalente (mesma busca, locator novo)
+PAIRS = {
+    "EMPTY_STATE (legado, //*)": "EMPTY_STATE (escopado)",
+    "LISTBOX_VISIBLE (legado, XPath)": "LISTBOX_VISIBLE",
+    "ROWS_PER_PAGE_BUTTON (legado, XPath)": "ROWS_PER_PAGE_BUTTON",
+}
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), "snapshots")
+
+
+def synthetic_snapshot(noise_nodes: int = 8000) -> str:
+    model = FakeScreener({"United States": make_rows("United States", 100)}, rows_per_page=100)
+    page = FakeWebDriver(model).render_html()
+    noise = "".join(
+        f"<div class='quote-card'><span>Headline {i}</span><a href='/q/{i}'>Ticker {i}</a></div>"
+        for i in range(noise_nodes // 3)
+    )
+    return page.replace("<main>", f"<div id='header'>{noise}</div><main>", 1)
+
+
+def time_it(fn, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, len(result) if isinstance(result, list) else int(bool(result))
+
+
+def bench_snapshot_chrome(client, label: str, path: str, repeat: int) -> None:
+    from app.pages.yahoo_screener_page import Scripts
+
+    client.open("file://" + os.path.abspath(path))
+    driver = client.driver
+    scope = driver.find_elements(*Locators.SCREENER_CONTAINER) or driver.find_elements(*Locators.BODY)
+    print(f"\n{label} (chrome)")
+
+    for name, (by, value) in list(LEGACY.items()) + list(CURRENT.items()):
+        node = scope[0] if value.startswith(".") and scope else driver
+        secs, found = time_it(lambda: node.find_elements(by, value), repeat)
+        print(f"  {name:<40} {secs * 1000:9.3f} ms  ({found} encontrados)")
+
+    secs, _ = time_it(
+        lambda: driver.execute_script(
+            Scripts.RESULTS_STATE, Locators.TABLE_ROWS[1], Locators.SCREENER_CONTAINER[1], Locators.EMPTY_STATE[1]
+        ),
+        repeat,
+    )
+    print(f"  {'RESULTS_STATE (script)':<40} {secs * 1000:9.3f} ms")
+
+
+def as_xpath(locator) -> str:
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        # mesma semântica do seletor CSS, avaliada pelo mesmo motor do XPath
+        return HTMLTranslator().css_to_xpath(value)
+    return value
+
+
+def bench_snapshot(label: str, html: str, repeat: int) -> None:
+    tree = lxml.html.fromstring(html)
+    scope = (tree.xpath("//main") or [tree])[0]
+
+    print(f"\n{label}: {len(tree.xpath('//*'))} nós (lxml; CSS traduzido para XPath)")
+
+    def run(locator):
+        xpath = lxml.etree.XPath(as_xpath(locator))
+        # locators relativos (".//") são avaliados a partir do container
+        node = scope if locator[1].startswith(".") else tree
+        return lambda: xpath(node)
+
+    results = {}
+    for name, locator in list(LEGACY.items()) + list(CURRENT.items()):
+        results[name] = time_it(run(locator), repeat)
+
+    print(f"  {'legado x atual':<40} {'legado':>10} {'atual':>10}")
+    for legacy, current in PAIRS.items():
+        (old, old_found), (new, new_found) = results[legacy], results[current]
+        print(f"  {current:<40} {old * 1000:7.3f} ms {new * 1000:7.3f} ms  ({old_found}/{new_found} encontrados)")
+
+    print(f"  {'locators atuais':<40}")
+    for name in CURRENT:
+        secs, found = results[name]
+        print(f"  {name:<40} {secs * 1000:9.3f} ms  ({found} encontrados)")
+
+    # proxy do Scripts.RESULTS_STATE: linhas (CSS) e, sem elas, a sonda de texto escopada
+    rows, empty = lxml.etree.XPath(as_xpath(Locators.TABLE_ROWS)), lxml.etree.XPath(Locators.EMPTY_STATE[1])
+
+    def results_state():
+        return "rows" if rows(tree) else ("empty" if empty(scope) else None)
+
+    secs, _ = time_it(results_state, repeat)
+    print(f"  {'RESULTS_STATE (linhas + sonda escopada)':<40} {secs * 1000:9.3f} ms")
+
+
+def capture(path: str) -> None:
+    """Abre o screener no Chrome e grava o DOM renderizado (página pronta)."""
+    from app.pages.yahoo_screener_page import YahooScreenerPage
+    from app.selenium_client import SeleniumClient
+
+    client = SeleniumClient()
+    try:
+        YahooScreenerPage(client, debug=False).open()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(client.get_page_source())
+    finally:
+        client.close()
+    print(f"snapshot salvo em {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("snapshots", nargs="*")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chrome", action="store_true", help="mede no Chrome (requer snapshots em arquivo)")
+    parser.add_argument("--capture", metavar="ARQUIVO", help="grava um snapshot do screener real e sai")
+    args = parser.parse_args()
+
+    if args.capture:
+        capture(args.capture)
+        return
+
+    snapshots = args.snapshots or sorted(glob.glob(os.path.join(SNAPSHOT_DIR, "*.html")))
+
+    if args.chrome:
+        from app.selenium_client import SeleniumClient
+
+        client = SeleniumClient()
+        try:
+            for path in snapshots:
+                bench_snapshot_chrome(client, path, path, args.repeat)
+        finally:
+            client.close()
+        return
+
+    if not snapshots:
+        bench_snapshot("snapshot sintético", synthetic_snapshot(), args.repeat)
+    for path in snapshots:
+        with open(path, encoding="utf-8") as f:
+            bench_snapshot(path, f.read(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Microbenchmarks do YahooScreenerPage sobre o FakeWebDriver (sem Chrome).
+
+Mede o overhead do próprio page object (waits, toggles, pager) e quantos
+comandos WebDriver cada etapa custa; com render_delay=0 roda em milissegundos.
+
+Uso:
+    python -m benchmarks.bench_page_object [--rows 5000] [--repeat 5]
+"""
+import argparse
+import time
+
+from app.driver_metrics import instrument_driver
+from app.pages.yahoo_screener_page import YahooScreenerPage
+from tests.fake_webdriver import FakeClient, FakeScreener, FakeWebDriver, make_rows
+
+
+def build(rows: int, batch_scripts: bool = True, stale_on_render: bool = True):
+    model = FakeScreener(
+        {"United States": make_rows("United States", rows), "Brazil": make_rows("Brazil", rows)},
+        rows_per_page=100,
+        stale_on_render=stale_on_render,
+        cookie_banner=True,
+    )
+    driver = FakeWebDriver(model, batch_scripts=batch_scripts)
+    client = FakeClient(driver)
+    client.command_stats = instrument_driver(driver)
+    return client, YahooScreenerPage(client, debug=False)
+
+
+def bench_pager(rows: int, repeat: int, **kwargs) -> dict:
+    best = None
+    for _ in range(repeat):
+        client, page = build(rows, **kwargs)
+        page.open()
+        client.command_stats.reset()
+
+        t0 = time.perf_counter()
+        pages = sum(1 for _ in page.iter_pages_table_html())
+        elapsed = time.perf_counter() - t0
+
+        result = {"pages": pages, "ms_per_page": elapsed * 1000 / pages, "cmds_per_page": client.command_stats.total / pages}
+        if best is None or result["ms_per_page"] < best["ms_per_page"]:
+            best = result
+    return best
+
+
+def bench_apply_region(rows: int, repeat: int, **kwargs) -> dict:
+    client, page = build(rows, **kwargs)
+    page.open()
+    client.command_stats.reset()
+
+    t0 = time.perf_counter()
+    for i in range(repeat):
+        page.apply_region("Brazil" if i % 2 == 0 else "United States")
+    elapsed = time.perf_counter() - t0
+
+    return {"ms_per_apply": elapsed * 1000 / repeat, "cmds_per_apply": client.command_stats.total / repeat}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("batched scripts", {}),
+        ("fallback (sem scripts)", {"batch_scripts": False}),
+        ("render in-place (sem stale)", {"stale_on_render": False}),
+    ]
+    for label, kwargs in scenarios:
+        pager = bench_pager(args.rows, args.repeat, **kwargs)
+        apply = bench_apply_region(args.rows, args.repeat, **kwargs)
+        print(
+            f"{label:<28} pager: {pager['pages']} páginas, {pager['ms_per_page']:.3f} ms/página, "
+            f"{pager['cmds_per_page']:.1f} cmds/página | apply_region: {apply['ms_per_apply']:.3f} ms, "
+            f"{apply['cmds_per_apply']:.1f} cmds"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Mede o time-to-ready de YahooScreenerPage.open() com perfil frio e quente.
+
+Uso (requer Chrome):
+    python -m benchmarks.bench_profile_open --user-data-dir /tmp/yahoo-profile
+"""
+import argparse
+
+from app.browser_profile import BrowserProfile
+from app.pages.yahoo_screener_page import YahooScreenerPage
+from app.selenium_client import SeleniumClient
+
+
+def time_open(profile: BrowserProfile) -> float:
+    client = SeleniumClient(profile=profile)
+    try:
+        page = YahooScreenerPage(client, debug=False)
+        page.open()
+        return page.last_open_seconds
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-data-dir", required=True)
+    parser.add_argument("--warm-runs", type=int, default=3)
+    args = parser.parse_args()
+
+    profile = BrowserProfile(args.user_data_dir)
+    profile.reset()
+
+    cold = time_open(profile)
+    print(f"cold: {cold:.2f}s")
+
+    for i in range(args.warm_runs):
+        print(f"warm[{i}]: {time_open(profile):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
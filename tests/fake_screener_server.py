@@ -0,0 +1,98 @@
+"""
+Stand-in local da API do screener (/v1/test/getcrumb e /v1/finance/screener)
+para testar o HttpScreenerEngine sem rede. HTTP/1.1 com keep-alive, latência
+configurável e contagem de conexões abertas.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+COOKIE = "A3=consent-ok"
+CRUMB = "abc/123.x"
+
+
+def make_quotes(code: str, n: int) -> list[dict]:
+    return [
+        {
+            "symbol": f"{code.upper()}{i:05d}",
+            "longName": f"{code.upper()} Corp {i}",
+            "regularMarketPrice": {"raw": 10 + i / 100, "fmt": f"{10 + i / 100:.2f}"},
+        }
+        for i in range(n)
+    ]
+
+
+class FakeScreenerServer:
+    def __init__(self, quotes_by_code: dict, latency: float = 0.0):
+        self.quotes_by_code = quotes_by_code
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                return
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _authorized(self) -> bool:
+                return COOKIE in (self.headers.get("Cookie") or "")
+
+            def do_GET(self):
+                if urlparse(self.path).path == "/v1/test/getcrumb" and self._authorized():
+                    return self._send(200, CRUMB.encode(), "text/plain")
+                return self._send(401, b"")
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                url = urlparse(self.path)
+                crumb = parse_qs(url.query).get("crumb", [""])[0]
+                if url.path != "/v1/finance/screener" or crumb != CRUMB or not self._authorized():
+                    return self._send(401, b'{"finance": {"error": "Unauthorized"}}')
+
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                code = body["query"]["operands"][0]["operands"][0]["operands"][1]
+                quotes = server.quotes_by_code.get(code, [])
+                page = quotes[body["offset"]:body["offset"] + body["size"]]
+                result = {"finance": {"result": [{"total": len(quotes), "count": len(page), "quotes": page}]}}
+                return self._send(200, json.dumps(result).encode())
+
+        return Handler
@@ -0,0 +1,547 @@
+"""
+WebDriver em memória para exercitar o YahooScreenerPage sem Chrome.
+
+Modela um screener paginado (filtros Region/Sector/..., rows-per-page, pager) com
+atraso de renderização configurável e elementos que ficam stale quando a
+tabela é re-renderizada. Todos os comandos passam por FakeWebDriver.execute,
+como no Selenium real, então instrument_driver() funciona sem mudanças.
+"""
+from __future__ import annotations
+
+import html
+import math
+import re
+import time
+from typing import Optional
+
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support.ui import WebDriverWait
+
+from app.pages.yahoo_screener_page import Locators, Scripts
+
+
+def make_rows(region: str, n: int, prefix: Optional[str] = None) -> list[dict]:
+    prefix = prefix or region[:2].upper()
+    return [{"symbol": f"{prefix}{i:05d}", "name": f"{region} Corp {i}", "price": f"{10 + i % 90}.{i % 100:02d}"}
+            for i in range(n)]
+
+
+class FakeScreener:
+    """
+    Estado do screener: o que a UI mostraria em cada instante.
+
+    Além de Region (chaves de rows_by_region), `filters` declara dropdowns
+    extras {nome: opções}; uma linha passa no filtro se row[nome] estiver
+    entre as opções aplicadas (nenhuma aplicada = sem filtro).
+    """
+
+    def __init__(
+        self,
+        rows_by_region: dict[str, list[dict]],
+        initial_regions=("United States",),
+        filters: Optional[dict[str, tuple]] = None,
+        rows_per_page: int = 25,
+        rows_per_page_options=(25, 50, 100),
+        render_delay: float = 0.0,
+        stale_on_render: bool = True,
+        cookie_banner: bool = False,
+        blank_while_loading: bool = False,
+        hidden_empty_text: bool = False,
+    ):
+        self.rows_by_region = rows_by_region
+        self.applied = set(initial_regions)
+        self.checked = set(self.applied)
+        self.filters = dict(filters or {})
+        self.applied_filters: dict[str, set] = {name: set() for name in self.filters}
+        self.open_filter = "Region"
+        self.rows_per_page = rows_per_page
+        self.rows_per_page_options = tuple(rows_per_page_options)
+        self.render_delay = render_delay
+        self.stale_on_render = stale_on_render
+        self.cookie_banner = cookie_banner
+        # tbody vazio enquanto um render está pendente (loading real do Yahoo)
+        self.blank_while_loading = blank_while_loading
+        # "No results" escondido no DOM (JSON em <script>, template oculto)
+        self.hidden_empty_text = hidden_empty_text
+
+        self.page = 0
+        self.dialog_open = False
+        self.listbox_open = False
+        self.generation = 0
+        self.renders = 0
+        self._pending: list[tuple[float, object]] = []
+
+    # ------------------ dados ------------------
+
+    def rows(self) -> list[dict]:
+        regions = self.applied or set(self.rows_by_region)
+        rows = [r for name in self.rows_by_region if name in regions for r in self.rows_by_region[name]]
+        for name, values in self.applied_filters.items():
+            if values:
+                rows = [r for r in rows if r.get(name) in values]
+        return rows
+
+    def options(self, name: str) -> list[str]:
+        return list(self.rows_by_region) if name == "Region" else list(self.filters[name])
+
+    def applied_for(self, name: str) -> set:
+        return self.applied if name == "Region" else self.applied_filters[name]
+
+    def open_dialog(self, name: str) -> None:
+        self.dialog_open = not self.dialog_open
+        self.open_filter = name
+        self.checked = set(self.applied_for(name))
+
+    def last_page(self) -> int:
+        return max(0, math.ceil(len(self.rows()) / self.rows_per_page) - 1)
+
+    @property
+    def loading(self) -> bool:
+        return self.blank_while_loading and bool(self._pending)
+
+    def page_rows(self) -> list[dict]:
+        if self.loading:
+            return []
+        start = self.page * self.rows_per_page
+        return self.rows()[start:start + self.rows_per_page]
+
+    # ------------------ renderização ------------------
+
+    def render(self, change) -> None:
+        """Aplica a mudança agora ou após render_delay; cada render troca a geração."""
+        if self.render_delay <= 0:
+            self._commit(change)
+        else:
+            self._pending.append((time.monotonic() + self.render_delay, change))
+
+    def tick(self) -> None:
+        now = time.monotonic()
+        due = [c for t, c in self._pending if t <= now]
+        self._pending = [(t, c) for t, c in self._pending if t > now]
+        for change in due:
+            self._commit(change)
+
+    def _commit(self, change) -> None:
+        change()
+        self.generation += 1
+        self.renders += 1
+
+    # ------------------ ações ------------------
+
+    def set_page(self, page: int) -> None:
+        def change():
+            self.page = page
+        self.render(change)
+
+    def apply(self) -> None:
+        self.dialog_open = False
+        name, applied = self.open_filter, set(self.checked)
+
+        def change():
+            if name == "Region":
+                self.applied = applied
+            else:
+                self.applied_filters[name] = applied
+            self.page = 0
+        self.render(change)
+
+    def set_rows_per_page(self, value: int) -> None:
+        self.listbox_open = False
+
+        def change():
+            self.rows_per_page = value
+            self.page = 0
+        self.render(change)
+
+
+class FakeElement:
+    # tipos cujos nós são recriados a cada render da tabela
+    TABLE_KINDS = {"table", "tbody", "row", "empty"}
+
+    def __init__(self, driver: "FakeWebDriver", kind: str, key=None):
+        self._driver = driver
+        self.kind = kind
+        self.key = key
+        model = driver.model
+        self._generation = model.generation if (kind in self.TABLE_KINDS and model.stale_on_render) else None
+
+    def __repr__(self):
+        return f"<FakeElement {self.kind}:{self.key}>"
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, FakeElement)
+            and (self.kind, self.key, self._generation) == (other.kind, other.key, other._generation)
+        )
+
+    def __hash__(self):
+        return hash((self.kind, self.key, self._generation))
+
+    def _check_alive(self) -> None:
+        if self._generation is not None and self._generation != self._driver.model.generation:
+            raise StaleElementReferenceException(f"{self!r} foi re-renderizado")
+
+    def _exec(self, command: str, **params):
+        return self._driver.execute(command, {"element": self, **params})["value"]
+
+    # ------------------ API WebElement ------------------
+
+    @property
+    def text(self) -> str:
+        return self._exec(Command.GET_ELEMENT_TEXT)
+
+    def get_attribute(self, name: str):
+        return self._exec(Command.GET_ELEMENT_ATTRIBUTE, name=name)
+
+    def is_selected(self) -> bool:
+        return self._exec(Command.IS_ELEMENT_SELECTED)
+
+    def is_enabled(self) -> bool:
+        return self._exec(Command.IS_ELEMENT_ENABLED)
+
+    def is_displayed(self) -> bool:
+        return self._exec("isElementDisplayed")
+
+    def click(self) -> None:
+        self._exec(Command.CLICK_ELEMENT)
+
+    def find_element(self, by, value):
+        return self._exec(Command.FIND_CHILD_ELEMENT, using=by, value=value)
+
+    def find_elements(self, by, value):
+        return self._exec(Command.FIND_CHILD_ELEMENTS, using=by, value=value)
+
+
+class FakeWebDriver:
+    """Subconjunto do WebDriver usado pelo page object."""
+
+    PAGER_BUTTONS = {
+        Locators.FIRST_PAGE[1]: "first",
+        Locators.PREV_PAGE[1]: "prev",
+        Locators.NEXT_PAGE[1]: "next",
+        Locators.LAST_PAGE[1]: "last",
+    }
+
+    def __init__(self, model: FakeScreener, batch_scripts: bool = True):
+        self.model = model
+        # False: recusa os Scripts.* do page object (força o caminho de fallback)
+        self.batch_scripts = batch_scripts
+        self.current_url: Optional[str] = None
+        self.commands = 0
+        self.unknown_locators: list[str] = []
+
+    # ------------------ API WebDriver ------------------
+
+    def get(self, url: str) -> None:
+        self.execute(Command.GET, {"url": url})
+
+    @property
+    def page_source(self) -> str:
+        return self.execute(Command.GET_PAGE_SOURCE)["value"]
+
+    def find_element(self, by, value):
+        return self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})["value"]
+
+    def find_elements(self, by, value):
+        return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})["value"]
+
+    def execute_script(self, script: str, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)})["value"]
+
+    def quit(self) -> None:
+        return None
+
+    # ------------------ despacho (um "round trip" por chamada) ------------------
+
+    def execute(self, driver_command: str, params: Optional[dict] = None) -> dict:
+        self.commands += 1
+        self.model.tick()
+        params = params or {}
+        el: Optional[FakeElement] = params.get("element")
+        if el is not None:
+            el._check_alive()
+
+        if driver_command == Command.GET:
+            self.current_url = params["url"]
+            value = None
+        elif driver_command == Command.GET_PAGE_SOURCE:
+            value = self.render_html()
+        elif driver_command in (Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENTS):
+            value = self._find(el, params["value"])
+        elif driver_command in (Command.FIND_ELEMENT, Command.FIND_CHILD_ELEMENT):
+            found = self._find(el, params["value"])
+            if not found:
+                raise NoSuchElementException(params["value"])
+            value = found[0]
+        elif driver_command == Command.W3C_EXECUTE_SCRIPT:
+            value = self._script(params["script"], params["args"])
+        elif driver_command == Command.GET_ELEMENT_TEXT:
+            value = self._text(el)
+        elif driver_command == Command.GET_ELEMENT_ATTRIBUTE:
+            value = self._attribute(el, params["name"])
+        elif driver_command == Command.IS_ELEMENT_SELECTED:
+            value = el.kind == "checkbox" and el.key in self.model.checked
+        elif driver_command == Command.IS_ELEMENT_ENABLED:
+            value = self._enabled(el)
+        elif driver_command == "isElementDisplayed":
+            value = not (el.kind == "empty" and el.key == "hidden")
+        elif driver_command == Command.CLICK_ELEMENT:
+            value = self._click(el)
+        else:
+            raise NotImplementedError(driver_command)
+        return {"value": value}
+
+    # ------------------ localização ------------------
+
+    def _el(self, kind: str, key=None) -> FakeElement:
+        return FakeElement(self, kind, key)
+
+    def _rows(self) -> list[FakeElement]:
+        return [self._el("row", i) for i in range(len(self.model.page_rows()))]
+
+    def _button(self, name: str) -> FakeElement:
+        return self._el("button", name)
+
+    def _find(self, scope: Optional[FakeElement], value: str) -> list[FakeElement]:
+        m = self.model
+        option = re.search(r"normalize-space\(\.\)='([^']*)'", value)
+
+        if scope is None:
+            if value in (Locators.TABLE[1], Locators.TBODY[1]):
+                return [self._el(value.split()[-1])]
+            if value == Locators.TABLE_ROWS[1]:
+                return self._rows()
+            if value in self.PAGER_BUTTONS:
+                return [self._button(self.PAGER_BUTTONS[value])]
+            if value == Locators.ROWS_PER_PAGE_BUTTON[1]:
+                return [self._button("rows")]
+            for name in ("Region", *m.filters):
+                if value in (Locators.filter_menu_button_css(name)[1], Locators.filter_menu_button(name)[1]):
+                    return [self._button(f"filter:{name}")]
+            if value in (Locators.SCREENER_CONTAINER[1], Locators.BODY[1]):
+                return [self._el(value)]
+            if value == Locators.DIALOG_CONTAINERS[1]:
+                return [self._el("dialog")]
+            if value == Locators.LISTBOX_VISIBLE[1]:
+                return [self._el("listbox")] if m.listbox_open else []
+            if value == Locators.COOKIE_ACCEPT[1]:
+                return [self._button("cookie")] if m.cookie_banner else []
+            if option and value.startswith(".//*[@role='option'"):
+                return self._find(self._el("listbox"), value) if m.listbox_open else []
+        elif scope.kind in ("main", "body") and value == Locators.EMPTY_STATE[1]:
+            hidden = [self._el("empty", "hidden")] if m.hidden_empty_text else []
+            return hidden + ([] if m.page_rows() or m.loading else [self._el("empty")])
+        elif scope.kind == "dialog":
+            if value == Locators.APPLY_BUTTON_IN_DIALOG[1]:
+                return [self._button("apply")] if m.dialog_open else []
+            if value == Locators.OPTIONS_LABELS_IN_DIALOG[1]:
+                return [self._el("label", name) for name in m.options(m.open_filter)] if m.dialog_open else []
+            target = re.search(r"\)='([^']*)'\]", value)
+            if target and "translate(@aria-label" in value:
+                return [self._el("label", n) for n in m.options(m.open_filter) if n.lower() == target.group(1)][:1]
+        elif scope.kind == "label":
+            if value == ".//span":
+                return [self._el("span", scope.key)]
+            if value == ".//input[@type='checkbox']":
+                return [self._el("checkbox", scope.key)]
+        elif scope.kind == "listbox" and option:
+            wanted = option.group(1)
+            return [self._el("option", wanted)] if wanted in {str(v) for v in m.rows_per_page_options} else []
+
+        self.unknown_locators.append(value)
+        raise InvalidSelectorException(f"FakeWebDriver: locator não modelado: {value}")
+
+    # ------------------ estado dos elementos ------------------
+
+    def _row_text(self, row: dict) -> str:
+        return f"{row['symbol']} {row['name']} {row['price']}"
+
+    def _text(self, el: FakeElement) -> str:
+        m = self.model
+        if el.kind == "row":
+            rows = m.page_rows()
+            return self._row_text(rows[el.key]) if el.key < len(rows) else ""
+        if el.kind in ("tbody", "table"):
+            return "\n".join(self._row_text(r) for r in m.page_rows())
+        if el.kind in ("span", "label"):
+            return el.key
+        if el.kind == "empty":
+            return "No results found"
+        if el.kind == "option":
+            return el.key
+        return ""
+
+    def _disabled(self, name: str) -> bool:
+        m = self.model
+        if name in ("first", "prev"):
+            return m.page == 0
+        if name in ("next", "last"):
+            return m.page >= m.last_page()
+        return False
+
+    def _enabled(self, el: FakeElement) -> bool:
+        if el.kind == "button" and el.key == "apply":
+            return self.model.checked != self.model.applied_for(self.model.open_filter)
+        if el.kind == "button":
+            return not self._disabled(el.key)
+        return True
+
+    def _attribute(self, el: FakeElement, name: str):
+        m = self.model
+        if el.kind == "table" and name == "outerHTML":
+            return self._table_html()
+        if el.kind == "dialog":
+            return {
+                "aria-hidden": "false" if m.dialog_open else "true",
+                "class": "dialog-container menu-surface-dialog" + ("" if m.dialog_open else " tw-hidden"),
+                "id": "region-filter-dialog",
+            }.get(name)
+        if el.kind == "button":
+            if el.key == "rows" and name in ("aria-label", "title"):
+                return str(m.rows_per_page)
+            if el.key == "apply" and name == "disabled":
+                return None if self._enabled(el) else "true"
+            if name == "disabled":
+                return "true" if self._disabled(el.key) else None
+            if name == "aria-disabled":
+                return "true" if self._disabled(el.key) else "false"
+            if name == "class":
+                return "icon-btn" + (" disabled" if self._disabled(el.key) else "")
+        return None
+
+    def _click(self, el: FakeElement) -> None:
+        m = self.model
+        if el.kind == "button":
+            if el.key == "next" and not self._disabled("next"):
+                m.set_page(m.page + 1)
+            elif el.key == "prev" and not self._disabled("prev"):
+                m.set_page(m.page - 1)
+            elif el.key == "first" and m.page != 0:
+                m.set_page(0)
+            elif el.key == "last" and not self._disabled("last"):
+                m.set_page(m.last_page())
+            elif el.key.startswith("filter:"):
+                m.open_dialog(el.key.split(":", 1)[1])
+            elif el.key == "apply" and self._enabled(el):
+                m.apply()
+            elif el.key == "rows":
+                m.listbox_open = not m.listbox_open
+            elif el.key == "cookie":
+                m.cookie_banner = False
+        elif el.kind in ("label", "checkbox"):
+            m.checked ^= {el.key}
+        elif el.kind == "option":
+            m.set_rows_per_page(int(el.key))
+
+    # ------------------ scripts ------------------
+
+    def _script(self, script: str, args: list):
+        batched = (
+            Scripts.PAGE_SIGNATURE,
+            Scripts.TBODY_TEXT,
+            Scripts.TABLE_SNAPSHOT,
+            Scripts.BUTTON_STATE,
+            Scripts.RESULTS_STATE,
+        )
+        if script in batched and not self.batch_scripts:
+            raise JavascriptException("FakeWebDriver: scripts em lote desabilitados")
+        if script == Scripts.PAGE_SIGNATURE:
+            return "\n".join(self._row_text(r) for r in self.model.page_rows()[:3])
+        if script == Scripts.TBODY_TEXT:
+            return self._text(self._el("tbody"))
+        if script == Scripts.TABLE_SNAPSHOT:
+            rows = self._rows()
+            sig = "\n".join(self._row_text(r) for r in self.model.page_rows()[:3])
+            return [self._el("tbody"), rows[0] if rows else None, sig]
+        if script == Scripts.RESULTS_TOTAL:
+            return f"{len(self.model.rows()):,}"
+        if script == Scripts.RESULTS_STATE:
+            # mesma semântica do JS: empty-state só conta se estiver visível
+            if self.model.page_rows():
+                return "rows"
+            return None if self.model.loading else "empty"
+        if script == Scripts.BUTTON_STATE:
+            name = self.PAGER_BUTTONS.get(args[0])
+            return [self._button(name), self._disabled(name)] if name else None
+        if script == "arguments[0].click();":
+            return self._click(args[0])
+        if "scrollIntoView" in script:
+            return None
+        raise JavascriptException(f"FakeWebDriver: script não modelado: {script[:60]}")
+
+    # ------------------ HTML ------------------
+
+    def _table_html(self) -> str:
+        body = "".join(
+            "<tr><td><input type='checkbox'/></td>"
+            f"<td>{html.escape(r['symbol'])}</td><td>{html.escape(r['name'])}</td>"
+            f"<td></td><td>{html.escape(r['price'])}</td></tr>"
+            for r in self.model.page_rows()
+        )
+        return f"<table><thead><tr><th></th><th>Symbol</th><th>Name</th><th></th><th>Price</th></tr></thead>" \
+               f"<tbody>{body}</tbody></table>"
+
+    def render_html(self) -> str:
+        m = self.model
+        labels = "".join(
+            f"<label title='{html.escape(n)}' aria-label='{html.escape(n)}'>"
+            f"<input type='checkbox'{' checked' if n in m.checked else ''}/><span>{html.escape(n)}</span></label>"
+            for n in m.options(m.open_filter)
+        )
+        menus = "".join(
+            f"<button aria-haspopup='true' data-ylk='slk:{html.escape(name)}'><div>{html.escape(name)}</div></button>"
+            for name in ("Region", *m.filters)
+        )
+        pager = "".join(
+            f"<button data-testid='{name}-page-button'{' disabled' if self._disabled(name) else ''}>{name}</button>"
+            for name in ("first", "prev", "next", "last")
+        )
+        return (
+            "<html><body><main><div id='screener'>"
+            f"{menus}"
+            f"<div class='dialog-container menu-surface-dialog{'' if m.dialog_open else ' tw-hidden'}'"
+            f" aria-hidden='{'false' if m.dialog_open else 'true'}'>"
+            f"<div class='options'>{labels}</div><button aria-label='Apply'>Apply</button></div>"
+            f"<div>1-{len(m.page_rows())} of {len(m.rows()):,} results</div>"
+            f"{self._table_html()}"
+            "<button aria-haspopup='listbox' data-ylk='sec:screener-table;subsec:custom-screener'"
+            f" aria-label='{m.rows_per_page}'>{m.rows_per_page}</button>"
+            f"<div role='listbox' class='menu{'' if m.listbox_open else ' tw-hidden'}'"
+            f" aria-hidden='{'false' if m.listbox_open else 'true'}'>"
+            + "".join(f"<div role='option' data-value='{v}'>{v}</div>" for v in m.rows_per_page_options)
+            + "</div>"
+            f"<div>{pager}</div>{'' if m.page_rows() or m.loading else '<div>No results found</div>'}"
+            + ("<script type='application/json'>{\"empty\": \"No results found\"}</script>" if m.hidden_empty_text else "")
+            + "</div></main></body></html>"
+        )
+
+
+class FakeClient:
+    """Equivalente ao SeleniumClient, sobre o FakeWebDriver."""
+
+    def __init__(self, driver: FakeWebDriver, warm_profile: bool = False, timeout: float = 10):
+        self.driver = driver
+        self.wait = WebDriverWait(driver, timeout)
+        self.warm_profile = warm_profile
+        self.command_stats = None
+        self.wait_scheduler = None
+        self.closed = False
+
+    def mark_warm(self):
+        self.warm_profile = True
+
+    def open(self, url: str):
+        self.driver.get(url)
+
+    def get_page_source(self) -> str:
+        return self.driver.page_source
+
+    def close(self):
+        self.closed = True
+        self.driver.quit()
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from app.browser_profile import BrowserProfile
+
+
+def test_single_profile_path_and_warmth(tmp_path: Path):
+    profile = BrowserProfile(str(tmp_path / "profile"))
+
+    path = profile.prepare()
+    assert path == str(tmp_path / "profile")
+    assert profile.is_warm() is False
+
+    # Chrome cria "Default/" já na 1ª execução, mesmo se ela não passou do consentimento
+    (tmp_path / "profile" / "Default").mkdir()
+    assert profile.is_warm() is False
+
+    profile.mark_warm()
+    assert profile.is_warm() is True
+
+    profile.reset()
+    assert not (tmp_path / "profile").exists()
+
+
+def test_per_worker_profiles_copy_seed_without_locks(tmp_path: Path):
+    profile = BrowserProfile(str(tmp_path / "profile-{worker}"))
+
+    seed = Path(profile.prepare(0))
+    (seed / "Default").mkdir()
+    (seed / "Default" / "Cookies").write_text("consent")
+    (seed / "SingletonLock").write_text("lock")
+    profile.mark_warm(0)
+
+    worker = Path(profile.prepare(1))
+    assert worker == tmp_path / "profile-1"
+    assert (worker / "Default" / "Cookies").read_text() == "consent"
+    assert not (worker / "SingletonLock").exists()
+    assert profile.is_warm(1) is True
+
+    profile.reset()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reset_only_removes_worker_profiles(tmp_path: Path):
+    profile = BrowserProfile(str(tmp_path / "yahoo-{worker}"))
+    profile.prepare(0)
+    profile.prepare(12)
+    # vizinhos que casam com "yahoo-*" mas não são perfis de worker
+    (tmp_path / "yahoo-cache").mkdir()
+    (tmp_path / "yahoo-1-old").mkdir()
+
+    profile.reset()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["yahoo-1-old", "yahoo-cache"]
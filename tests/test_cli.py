@@ -0,0 +1,49 @@
+import json
+
+import app.cli as cli
+from app.cli import stream_ndjson
+from app.query_planner import ShardReport
+
+
+class LoggingService:
+    def iter_new_pages(self, region: str):
+        print("[YahooScreenerPage] log do crawl")
+        yield [{"symbol": "AAA", "name": "A", "price": "1"}]
+        yield [{"symbol": "BBB", "name": "B", "price": "2"}]
+
+
+def test_stream_ndjson_keeps_stdout_clean(capsys):
+    total = stream_ndjson(LoggingService(), "Brazil", "-")
+
+    out, err = capsys.readouterr()
+    assert total == 2
+    assert [json.loads(line)["symbol"] for line in out.splitlines()] == ["AAA", "BBB"]
+    assert "log do crawl" in err
+
+
+def test_shard_without_output_writes_default_csv(monkeypatch):
+    calls = {}
+
+    class FakeClient:
+        command_stats = None
+
+        def __init__(self, **kwargs):
+            pass
+
+        def close(self):
+            pass
+
+    class FakeService:
+        def __init__(self, **kwargs):
+            pass
+
+        def run_sharded(self, region, output, client_factory, **kwargs):
+            calls["output"] = output
+            return ShardReport(region, 0)
+
+    monkeypatch.setattr(cli, "SeleniumClient", FakeClient)
+    monkeypatch.setattr(cli, "CrawlerService", FakeService)
+
+    cli.crawl(["--region", "Brazil", "--shard"])
+
+    assert calls["output"] == "equities.csv"
@@ -1,4 +1,11 @@
+import asyncio
+
 import app.crawler_service as crawler_module
+from app.parser import EquityParser
+from app.price_store import PriceStore
+from app.symbol_index import SharedSymbolIndex, SymbolIndex
+from tests.fake_webdriver import FakeClient as DriverClient
+from tests.fake_webdriver import FakeScreener, FakeWebDriver, make_rows
 
 
 class FakeClient:
@@ -104,3 +111,241 @@ def test_crawler_always_closes_on_exception(monkeypatch):
         assert "boom" in str(e)
 
     assert service.client.closed is True
+
+
+class FakeStore:
+    def __init__(self):
+        self.ingested = []
+        self.finished = False
+
+    def begin_run(self, region: str):
+        return 1
+
+    def ingest(self, run_id, region, rows):
+        self.ingested.append([r["symbol"] for r in rows])
+
+    def finish_run(self, run_id):
+        self.finished = True
+
+
+def test_crawler_ingests_each_page_into_store(monkeypatch):
+    monkeypatch.setattr(crawler_module, "SeleniumClient", lambda: FakeClient())
+    monkeypatch.setattr(crawler_module, "YahooScreenerPage", FakePage)
+
+    store = FakeStore()
+    service = crawler_module.CrawlerService(store=store)
+    service.parser = FakeParser()
+    service.writer = FakeWriter()
+
+    service.run(region="Brazil", output="out.csv")
+
+    # uma ingestão por página, já deduplicada
+    assert store.ingested == [["AAA", "BBB"], ["CCC"]]
+    assert store.finished is True
+
+
+class ShardPage:
+    """Page fake com filtros: cada fatia devolve seus símbolos em uma página."""
+
+    DATA = {
+        (("Region", "US"),): ["AAA", "BBB", "CCC", "DDD"],
+        (("Region", "US"), ("Sector", "Energy")): ["AAA", "BBB"],
+        (("Region", "US"), ("Sector", "Tech")): ["CCC", "BBB"],  # BBB repetido entre fatias
+    }
+
+    def __init__(self, client, debug=True):
+        self.client = client
+        self.filters = {}
+
+    def open(self):
+        pass
+
+    def set_filters(self, filters):
+        self.filters = dict(filters)
+
+    def get_result_count(self):
+        return len(self.DATA[tuple(self.filters.items())])
+
+    def iter_pages_table_html(self):
+        yield ",".join(self.DATA[tuple(self.filters.items())])
+
+
+class CsvSymbolsParser:
+    def parse(self, html: str):
+        return [{"symbol": s, "name": s, "price": "1"} for s in html.split(",")]
+
+
+def test_run_sharded_merges_slices_and_checks_completeness(monkeypatch):
+    monkeypatch.setattr(crawler_module, "SeleniumClient", lambda: FakeClient())
+    monkeypatch.setattr(crawler_module, "YahooScreenerPage", ShardPage)
+
+    worker_clients = []
+
+    def client_factory(worker_id):
+        worker_clients.append(FakeClient())
+        return worker_clients[-1]
+
+    service = crawler_module.CrawlerService()
+    service.parser = CsvSymbolsParser()
+    service.writer = FakeWriter()
+
+    report = service.run_sharded(
+        "US", "out.csv", client_factory, workers=2, max_slice_rows=2,
+        dimensions=(("Sector", ("Energy", "Tech")),),
+    )
+
+    assert [s.label for s in report.slices] == ["US / Energy", "US / Tech"]
+    assert sorted(r["symbol"] for r in service.writer.written) == ["AAA", "BBB", "CCC"]
+    assert (report.expected, report.collected, report.missing) == (4, 3, 1)
+    assert report.complete is False
+    assert service.client.closed is True
+    assert worker_clients and all(c.closed for c in worker_clients)
+
+
+def test_iter_rows_streams_deduplicated_rows(monkeypatch):
+    monkeypatch.setattr(crawler_module, "SeleniumClient", lambda: FakeClient())
+    monkeypatch.setattr(crawler_module, "YahooScreenerPage", FakePage)
+
+    service = crawler_module.CrawlerService()
+    service.parser = FakeParser()
+
+    rows = service.iter_rows("Brazil")
+    assert next(rows)["symbol"] == "AAA"
+    assert [r["symbol"] for r in rows] == ["BBB", "CCC"]
+    assert service.client.closed is True
+
+
+def test_aiter_rows_yields_rows_and_closes_on_early_exit(monkeypatch):
+    monkeypatch.setattr(crawler_module, "SeleniumClient", lambda: FakeClient())
+    monkeypatch.setattr(crawler_module, "YahooScreenerPage", FakePage)
+
+    async def collect(limit=None):
+        service = crawler_module.CrawlerService()
+        service.parser = FakeParser()
+        got = []
+        agen = service.aiter_rows("Brazil", buffer=1)
+        async for row in agen:
+            got.append(row["symbol"])
+            if limit and len(got) == limit:
+                break
+        await agen.aclose()
+        return got, service.client.closed
+
+    assert asyncio.run(collect()) == (["AAA", "BBB", "CCC"], True)
+    assert asyncio.run(collect(limit=1)) == (["AAA"], True)
+
+
+def test_aiter_rows_propagates_crawl_errors(monkeypatch):
+    class ExplodingPage(FakePage):
+        def open(self):
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(crawler_module, "SeleniumClient", lambda: FakeClient())
+    monkeypatch.setattr(crawler_module, "YahooScreenerPage", ExplodingPage)
+
+    async def consume():
+        return [r async for r in crawler_module.CrawlerService().aiter_rows("Brazil")]
+
+    try:
+        asyncio.run(consume())
+        assert False, "Expected exception"
+    except RuntimeError as e:
+        assert "boom" in str(e)
+
+
+class RegionEngine:
+    ROWS = {
+        "United States": [
+            {"symbol": "NVDA", "name": "NVIDIA Corporation", "price": "180.00"},
+            {"symbol": "AAPL", "name": "Apple Inc.", "price": "230.00"},
+        ],
+        "Brazil": [
+            {"symbol": "NNVDC34.SA", "name": "NVIDIA Corporation", "price": "19.95"},
+            {"symbol": "AAPL", "name": "Apple Inc.", "price": "230.00"},  # repetido entre regiões
+            {"symbol": "VALE3.SA", "name": "Vale S.A.", "price": "60.00"},
+        ],
+    }
+
+    def iter_page_rows(self, region):
+        yield list(self.ROWS[region])
+
+    def close(self):
+        pass
+
+
+def test_shared_index_dedupes_across_regions():
+    service = crawler_module.CrawlerService(engine=RegionEngine(), index=SymbolIndex())
+
+    us = [r["symbol"] for r in service.iter_rows("United States")]
+    br = [r["symbol"] for r in service.iter_rows("Brazil")]
+
+    assert us == ["NVDA", "AAPL"]
+    assert br == ["NNVDC34.SA", "VALE3.SA"]
+    assert service.index.issuer("NNVDC34.SA") == "NVIDIA"
+
+
+def test_dedupe_by_issuer_skips_cross_listings():
+    service = crawler_module.CrawlerService(engine=RegionEngine(), index=SymbolIndex(), dedupe_by="issuer")
+
+    rows = list(service.iter_rows("United States")) + list(service.iter_rows("Brazil"))
+
+    assert [r["symbol"] for r in rows] == ["NVDA", "AAPL", "VALE3.SA"]
+
+
+def test_store_gets_every_region_row_even_when_index_skips_output(tmp_path):
+    path = str(tmp_path / "symbols.db")
+    store = PriceStore(str(tmp_path / "prices.db"))
+    index = SharedSymbolIndex(path, run="r1")
+    service = crawler_module.CrawlerService(store=store, engine=RegionEngine(), index=index)
+
+    list(service.iter_rows("United States"))
+    br = [r["symbol"] for r in service.iter_rows("Brazil")]
+
+    # AAPL já saiu pelo run dos EUA, mas o histórico do Brasil fica completo
+    assert br == ["NNVDC34.SA", "VALE3.SA"]
+    assert [r["symbol"] for r in store.latest_snapshot("Brazil")] == ["AAPL", "NNVDC34.SA", "VALE3.SA"]
+
+    # dia seguinte, mesmo arquivo e sem --reset-symbol-index: run novo, saída completa
+    index.close()
+    service.index = SharedSymbolIndex(path)
+    assert [r["symbol"] for r in service.iter_rows("United States")] == ["NVDA", "AAPL"]
+    service.index.close()
+    store.close()
+
+
+def test_run_sharded_end_to_end_on_fake_driver():
+    sectors = ("Energy", "Technology", "Utilities")
+    rows = make_rows("United States", 120)
+    for i, r in enumerate(rows):
+        # a cada 10 linhas, uma sem setor: fica fora das fatias
+        r["Sector"] = None if i % 10 == 9 else sectors[i % 2]
+
+    def browser():
+        model = FakeScreener({"United States": rows, "Brazil": make_rows("Brazil", 5)},
+                             filters={"Sector": sectors})
+        return DriverClient(FakeWebDriver(model), warm_profile=True)
+
+    workers = []
+
+    def client_factory(worker_id):
+        workers.append(browser())
+        return workers[-1]
+
+    service = crawler_module.CrawlerService(client=browser())
+    service.parser = EquityParser()
+    service.writer = FakeWriter()
+
+    report = service.run_sharded(
+        "United States", "out.csv", client_factory, workers=2, max_slice_rows=50,
+        dimensions=(("Sector", sectors),),
+    )
+
+    assert [(s.label, s.estimate, s.oversized) for s in report.slices] == [
+        ("United States / Energy", 60, True),
+        ("United States / Technology", 48, False),
+    ]
+    assert sorted(r["symbol"] for r in service.writer.written) == sorted(
+        r["symbol"] for r in rows if r["Sector"]
+    )
+    assert (report.expected, report.collected, report.missing) == (120, 108, 12)
+    assert all(w.driver.unknown_locators == [] for w in workers)
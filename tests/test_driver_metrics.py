@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from app.driver_metrics import CommandStats, instrument_driver
+from app.pages.yahoo_screener_page import Locators, Scripts, YahooScreenerPage
+
+
+class ScriptDriver:
+    """Driver mínimo: execute_script passa por execute, como no Selenium."""
+
+    def __init__(self, results):
+        self.results = results
+        self.executed = []
+
+    def execute(self, driver_command, params=None):
+        self.executed.append((driver_command, params))
+        return {"value": self.results[params["script"]]}
+
+    def execute_script(self, script, *args):
+        return self.execute("w3cExecuteScript", {"script": script, "args": list(args)})["value"]
+
+
+def test_instrument_driver_counts_by_call_site():
+    driver = ScriptDriver({Scripts.PAGE_SIGNATURE: "r1\nr2\nr3"})
+    stats = instrument_driver(driver)
+    client = SimpleNamespace(driver=driver, wait=None, open=lambda url: None)
+
+    page = YahooScreenerPage(client, debug=False)
+    assert page._page_signature() == "r1\nr2\nr3"
+    assert page._page_signature() == "r1\nr2\nr3"
+
+    assert stats.total == 2
+    [row] = stats.summary()
+    assert row["site"] == "yahoo_screener_page:YahooScreenerPage._page_signature"
+    assert row["command"] == "w3cExecuteScript"
+    assert row["calls"] == 2
+
+
+def test_pager_button_is_a_single_round_trip():
+    button = object()
+    driver = ScriptDriver({Scripts.BUTTON_STATE: [button, True]})
+    stats = instrument_driver(driver, CommandStats())
+    client = SimpleNamespace(driver=driver, wait=None, open=lambda url: None)
+
+    page = YahooScreenerPage(client, debug=False)
+
+    assert page._pager_button(Locators.NEXT_PAGE) == (button, True)
+    assert stats.total == 1
+    assert driver.executed[0][1]["args"] == [Locators.NEXT_PAGE[1]]
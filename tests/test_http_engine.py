@@ -0,0 +1,76 @@
+import time
+
+import pytest
+import urllib3
+
+import app.crawler_service as crawler_module
+from app.engines.http_engine import HttpScreenerEngine, YahooSession, fetch_crumb, region_code
+from tests.fake_screener_server import COOKIE, CRUMB, FakeScreenerServer, make_quotes
+
+
+def session() -> YahooSession:
+    name, value = COOKIE.split("=", 1)
+    return YahooSession({name: value}, CRUMB)
+
+
+class ListWriter:
+    def __init__(self):
+        self.written = []
+
+    def write_rows(self, rows, path: str):
+        self.written.extend(rows)
+
+
+def test_region_code():
+    assert region_code("United States") == "us"
+    assert region_code(" brazil ") == "br"
+    assert region_code("AT") == "at"
+    with pytest.raises(ValueError):
+        region_code("Atlantis")
+
+
+def test_fetch_crumb_with_browser_cookies():
+    with FakeScreenerServer({}) as server:
+        crumb = fetch_crumb(urllib3.PoolManager(), server.base_url, session().cookies, "test-agent")
+
+    assert crumb == CRUMB
+
+
+def test_http_engine_crawls_all_pages_in_order_over_pooled_connections():
+    quotes = make_quotes("br", 1050)
+    with FakeScreenerServer({"br": quotes}) as server:
+        engine = HttpScreenerEngine(session(), base_url=server.base_url, page_size=100, concurrency=4)
+        service = crawler_module.CrawlerService(engine=engine)
+        service.writer = ListWriter()
+
+        total = service.run("Brazil", "out.csv")
+
+        assert service.client is None
+        assert total == 1050
+        assert [r["symbol"] for r in service.writer.written] == [q["symbol"] for q in quotes]
+        assert service.writer.written[1] == {"symbol": "BR00001", "name": "BR Corp 1", "price": "10.01"}
+        assert server.requests == 11
+        # keep-alive: as 11 páginas reaproveitam no máximo uma conexão por worker
+        assert server.connections <= 4
+
+
+def test_http_engine_rejects_bad_crumb():
+    with FakeScreenerServer({"br": make_quotes("br", 10)}) as server:
+        engine = HttpScreenerEngine(YahooSession({}, "wrong"), base_url=server.base_url)
+
+        with pytest.raises(RuntimeError):
+            list(engine.iter_page_rows("Brazil"))
+
+
+def test_http_engine_slow_consumer_holds_fetches_back():
+    with FakeScreenerServer({"br": make_quotes("br", 50_000)}, latency=0.01) as server:
+        engine = HttpScreenerEngine(session(), base_url=server.base_url, page_size=100, concurrency=4)
+        pages = engine.iter_page_rows("Brazil")
+
+        next(pages)
+        next(pages)
+        time.sleep(1.0)
+
+        # 1ª página em série + a janela de `concurrency` páginas em voo
+        assert server.requests <= 1 + engine.concurrency
+        pages.close()
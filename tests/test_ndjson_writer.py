@@ -0,0 +1,21 @@
+import io
+import json
+
+from app.ndjson_writer import NdjsonWriter
+
+
+def test_ndjson_writer_one_object_per_line():
+    out = io.StringIO()
+    rows = [
+        {"symbol": "AAMZO34.SA", "name": "Amazon.com, Inc.", "price": "52.02", "extra": "ignorado"},
+        {"symbol": "VALE3.SA", "name": "Vale S.A.", "price": "61.10"},
+    ]
+
+    n = NdjsonWriter().write_rows(rows, out)
+
+    lines = out.getvalue().splitlines()
+    assert n == 2
+    assert [json.loads(line) for line in lines] == [
+        {"symbol": "AAMZO34.SA", "name": "Amazon.com, Inc.", "price": "52.02"},
+        {"symbol": "VALE3.SA", "name": "Vale S.A.", "price": "61.10"},
+    ]
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from app.price_store import PriceStore
+
+
+def test_ingest_and_latest_snapshot(tmp_path: Path):
+    store = PriceStore(str(tmp_path / "prices.db"))
+
+    run_id = store.begin_run("Brazil")
+    store.ingest(run_id, "Brazil", [
+        {"symbol": "AAA", "name": "A", "price": "1,234.50"},
+        {"symbol": "BBB", "name": "B", "price": "-"},
+        {"symbol": "", "name": "sem símbolo", "price": "1"},
+    ])
+    store.finish_run(run_id)
+
+    snap = store.latest_snapshot("brazil")
+    assert [(r["symbol"], r["price"]) for r in snap] == [("AAA", 1234.5), ("BBB", None)]
+
+
+def test_history_and_top_movers_between_runs(tmp_path: Path):
+    store = PriceStore(str(tmp_path / "prices.db"))
+
+    r1 = store.begin_run("Brazil")
+    store.ingest(r1, "Brazil", [
+        {"symbol": "AAA", "name": "A", "price": "10"},
+        {"symbol": "BBB", "name": "B", "price": "20"},
+    ], ts=1.0)
+    store.finish_run(r1)
+    r2 = store.begin_run("Brazil")
+    store.ingest(r2, "Brazil", [
+        {"symbol": "AAA", "name": "A", "price": "11"},
+        {"symbol": "BBB", "name": "B", "price": "10"},
+        {"symbol": "CCC", "name": "C", "price": "5"},
+    ], ts=2.0)
+    store.finish_run(r2)
+
+    assert [r["price"] for r in store.history("AAA")] == [10.0, 11.0]
+
+    movers = store.top_movers("Brazil", limit=5)
+    assert [m["symbol"] for m in movers] == ["BBB", "AAA"]
+    assert round(movers[0]["change_pct"], 2) == -50.0
+
+
+def test_unfinished_run_is_ignored_by_default(tmp_path: Path):
+    store = PriceStore(str(tmp_path / "prices.db"))
+
+    r1 = store.begin_run("Brazil")
+    store.ingest(r1, "Brazil", [{"symbol": "AAA", "price": "10"}, {"symbol": "BBB", "price": "20"}])
+    store.finish_run(r1)
+    r2 = store.begin_run("Brazil")
+    store.ingest(r2, "Brazil", [{"symbol": "AAA", "price": "12"}])
+    store.finish_run(r2)
+    # crawl interrompido: run sem finished_at
+    r3 = store.begin_run("Brazil")
+    store.ingest(r3, "Brazil", [{"symbol": "AAA", "price": "99"}])
+
+    assert [r["price"] for r in store.latest_snapshot("Brazil")] == [12.0]
+    assert [(m["price_from"], m["price_to"]) for m in store.top_movers("Brazil")] == [(10.0, 12.0)]
+
+    assert store.latest_run_ids("Brazil", include_unfinished=True) == [r3]
+    assert [r["price"] for r in store.latest_snapshot("Brazil", include_unfinished=True)] == [99.0]
@@ -0,0 +1,56 @@
+from app.query_planner import QueryPlanner, Slice
+
+
+SIZES = {
+    ("Region",): 12_000,
+    ("Region", "Sector=Energy"): 4_000,
+    ("Region", "Sector=Technology"): 7_000,
+    ("Region", "Sector=Technology", "Cap=Small"): 5_000,
+    ("Region", "Sector=Technology", "Cap=Large"): 2_000,
+    ("Region", "Sector=Utilities"): 0,
+}
+
+
+def fake_estimate(slice_: Slice):
+    key = ("Region",) + tuple(f"{n}={v}" for n, v in slice_.filters[1:])
+    return SIZES.get(key)
+
+
+DIMENSIONS = (
+    ("Sector", ("Energy", "Technology", "Utilities")),
+    ("Cap", ("Small", "Large")),
+)
+
+
+def test_small_region_is_a_single_slice():
+    planner = QueryPlanner(fake_estimate, DIMENSIONS, max_slice_rows=20_000)
+
+    total, slices = planner.plan("Brazil")
+
+    assert total == 12_000
+    assert slices == [Slice((("Region", "Brazil"),), 12_000)]
+
+
+def test_big_slices_are_rebalanced_and_empty_ones_dropped():
+    planner = QueryPlanner(fake_estimate, DIMENSIONS, max_slice_rows=5_000)
+
+    total, slices = planner.plan("United States")
+
+    assert total == 12_000
+    assert [(s.label, s.estimate) for s in slices] == [
+        ("United States / Energy", 4_000),
+        ("United States / Technology / Small", 5_000),
+        ("United States / Technology / Large", 2_000),
+    ]
+
+
+def test_leaf_slice_still_too_big_is_flagged(capsys):
+    planner = QueryPlanner(fake_estimate, DIMENSIONS[:1], max_slice_rows=5_000, debug=True)
+
+    _, slices = planner.plan("United States")
+
+    assert [(s.label, s.oversized) for s in slices] == [
+        ("United States / Energy", False),
+        ("United States / Technology", True),
+    ]
+    assert "United States / Technology" in capsys.readouterr().out
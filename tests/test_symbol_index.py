@@ -0,0 +1,102 @@
+import threading
+from pathlib import Path
+
+from app.symbol_index import SharedSymbolIndex, SymbolIndex, issuer_key
+
+
+def test_issuer_key_links_cross_listings():
+    assert issuer_key("NVIDIA Corporation") == "NVIDIA"
+    assert issuer_key("NVIDIA CORP CEDEAR EACH 24 REP") == "NVIDIA"
+    assert issuer_key("Alphabet Inc.") == "ALPHABET"
+    assert issuer_key("Petróleo Brasileiro S.A. - Petrobras") == "PETROLEO BRASILEIRO SA PETROBRAS"
+    assert issuer_key("Vale S.A.") == "VALE"
+    assert issuer_key("--") == ""
+
+
+def test_symbol_index_survives_merges(monkeypatch):
+    monkeypatch.setattr(SymbolIndex, "MERGE_MIN", 8)
+    index = SymbolIndex()
+
+    assert all(index.add(f"SYM{i}", f"ISSUER{i % 3}") for i in range(100))
+    assert not any(index.add(f"SYM{i}") for i in range(100))
+
+    assert len(index) == 100
+    assert "SYM42" in index and "SYM100" not in index
+    assert index.issuer("SYM42") == "ISSUER0"
+    assert index.issuer_counts() == {"ISSUER0": 34, "ISSUER1": 33, "ISSUER2": 33}
+    assert index.nbytes < 100 * 20
+
+
+def test_shared_index_claims_each_key_once(tmp_path: Path):
+    path = str(tmp_path / "symbols.db")
+    claimed = {i: [] for i in range(4)}
+    errors = []
+
+    def worker(worker_id):
+        # uma conexão por worker, como processos separados; páginas sobrepostas
+        try:
+            index = SharedSymbolIndex(path, run="r1")
+            starts = range(0, 200, 25)
+            try:
+                for start in (reversed(starts) if worker_id % 2 else starts):
+                    page = [(f"SYM{i}", "") for i in range(start, start + 50)]
+                    flags = index.add_many(page)
+                    claimed[worker_id].extend(k for (k, _), new in zip(page, flags) if new)
+            finally:
+                index.close()
+        except BaseException as e:
+            # exceção em thread não falha o teste: o pytest só avisa
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in claimed]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    # cada chave vencida por um único worker
+    all_claimed = [k for keys in claimed.values() for k in keys]
+    assert len(all_claimed) == len(set(all_claimed))
+    assert sorted(all_claimed) == sorted({f"SYM{i}" for i in range(225)})
+
+    index = SharedSymbolIndex(path, run="r1")
+    assert len(index) == 225
+    assert "SYM0" in index
+    index.close()
+
+
+def test_shared_index_maps_listings_to_issuer(tmp_path: Path):
+    path = str(tmp_path / "symbols.db")
+    us, br = SharedSymbolIndex(path, run="r1"), SharedSymbolIndex(path, run="r1")
+
+    assert us.add("NVDA", issuer_key("NVIDIA Corporation"))
+    assert br.add_many([("NNVDC34.SA", "NVIDIA"), ("NVDA", "NVIDIA")]) == [True, False]
+
+    assert us.issuer("NNVDC34.SA") == "NVIDIA"
+    assert us.listings("NVIDIA") == ["NNVDC34.SA", "NVDA"]
+
+    us.close()
+    br.close()
+    SharedSymbolIndex.reset(path)
+    assert not Path(path).exists()
+
+
+def test_shared_index_keys_are_scoped_to_a_run(tmp_path: Path):
+    path = str(tmp_path / "symbols.db")
+
+    day1 = SharedSymbolIndex(path)
+    assert day1.add_many([("NVDA", ""), ("AAPL", "")]) == [True, True]
+    day1.close()
+
+    # sem rótulo: run novo, nada do run anterior é escondido
+    day2 = SharedSymbolIndex(path)
+    assert day2.add_many([("NVDA", ""), ("AAPL", "")]) == [True, True]
+    assert day2.run_id != day1.run_id
+    day2.close()
+
+    # mesmo rótulo: processos do mesmo run compartilham as chaves
+    a, b = SharedSymbolIndex(path, run="2026-10-18"), SharedSymbolIndex(path, run="2026-10-18")
+    assert a.add("NVDA") and not b.add("NVDA")
+    a.close()
+    b.close()
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+
+from app.wait_scheduler import WaitScheduler
+
+
+def test_uses_fixed_defaults_until_enough_samples():
+    waits = WaitScheduler(min_samples=5)
+    for _ in range(4):
+        waits.record("next_page", 0.3)
+
+    assert waits.timeout("next_page", 15) == 15
+    assert waits.poll("next_page", 0.2) == 0.2
+
+
+def test_timeout_and_poll_follow_observed_latency():
+    waits = WaitScheduler(min_samples=5, headroom=3.0, min_timeout=2.0)
+    for s in [0.2, 0.3, 0.3, 0.4, 0.4, 0.5, 0.5, 0.6, 0.8, 1.2]:
+        waits.record("next_page", s)
+
+    # p99 = 1.2s -> 3.6s (bem abaixo dos 15s fixos)
+    assert waits.timeout("next_page", 15) == pytest.approx(3.6)
+    # p50 = 0.4s -> poll 0.1s
+    assert waits.poll("next_page", 0.2) == pytest.approx(0.1)
+    # nunca passa do valor fixo nem fica abaixo do piso
+    assert waits.timeout("next_page", 3) == 3
+    for _ in range(200):
+        waits.record("results", 0.001)
+    assert waits.timeout("results", 10) == 2.0
+    assert waits.poll("results", 0.5) == waits.min_poll
+
+
+def test_stats_persist_between_runs(tmp_path: Path):
+    path = str(tmp_path / "waits.json")
+    waits = WaitScheduler(path, min_samples=3)
+    for s in (0.5, 0.6, 0.7):
+        waits.record("apply_filter", s)
+    waits.save()
+
+    reloaded = WaitScheduler(path, min_samples=3)
+    assert reloaded.quantile("apply_filter", 0.99) == 0.7
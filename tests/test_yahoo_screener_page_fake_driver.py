@@ -0,0 +1,185 @@
+import pytest
+
+from app.parser import EquityParser
+from app.pages.yahoo_screener_page import YahooScreenerPage
+from app.wait_scheduler import WaitScheduler
+from tests.fake_webdriver import FakeClient, FakeScreener, FakeWebDriver, make_rows
+
+
+def build_page(**model_kwargs):
+    model = FakeScreener(
+        {"United States": make_rows("United States", 120), "Brazil": make_rows("Brazil", 230)},
+        **model_kwargs,
+    )
+    driver = FakeWebDriver(model)
+    return model, driver, YahooScreenerPage(FakeClient(driver), debug=False)
+
+
+def crawl_symbols(page) -> list[str]:
+    parser = EquityParser()
+    return [r["symbol"] for html in page.iter_pages_table_html() for r in parser.parse(html)]
+
+
+def test_open_apply_region_and_paginate_all_rows():
+    model, driver, page = build_page(cookie_banner=True)
+
+    assert page.client.warm_profile is False
+    page.open()
+    assert model.cookie_banner is False
+    assert page.client.warm_profile is True
+    assert model.rows_per_page == 100
+
+    page.apply_region("Brazil")
+    assert model.applied == {"Brazil"}
+
+    assert crawl_symbols(page) == [r["symbol"] for r in make_rows("Brazil", 230)]
+    assert driver.unknown_locators == []
+
+
+def test_paginates_when_table_updates_in_place():
+    # sem re-render dos nós: só o hash do tbody sinaliza a troca de página
+    _, _, page = build_page(stale_on_render=False)
+    page.client.warm_profile = True
+
+    page.open()
+    page.apply_region("Brazil")
+
+    assert len(crawl_symbols(page)) == 230
+
+
+def test_paginates_with_render_delay():
+    model, _, page = build_page(render_delay=0.01, rows_per_page_options=(25,))
+    page.client.warm_profile = True
+    model.rows_by_region["United States"] = make_rows("United States", 40)
+
+    page.open()
+
+    assert len(crawl_symbols(page)) == 40
+    assert model.renders == 1
+
+
+def test_empty_region_resolves_via_scoped_empty_state():
+    for batch_scripts in (True, False):
+        model = FakeScreener({"United States": make_rows("United States", 30), "Greece": []})
+        driver = FakeWebDriver(model, batch_scripts=batch_scripts)
+        page = YahooScreenerPage(FakeClient(driver, warm_profile=True), debug=False)
+
+        page.open()
+        page.apply_region("Greece")
+
+        assert page._results_state() == "empty"
+        assert crawl_symbols(page) == []
+        assert driver.unknown_locators == []
+
+
+def test_region_menu_button_is_cached_between_applies():
+    _, driver, page = build_page()
+    page.client.warm_profile = True
+    page.open()
+
+    page.apply_region("Brazil")
+    cached = page._element_cache["filter_menu:Region"]
+    page.apply_region("United States")
+
+    assert page._element_cache["filter_menu:Region"] is cached
+
+
+def test_result_count_reads_total_from_screener():
+    _, _, page = build_page()
+    page.client.warm_profile = True
+    page.open()
+
+    page.apply_region("Brazil")
+
+    assert page.get_result_count() == 230
+    assert page.applied_filters == {"Region": "Brazil"}
+
+
+def test_pager_learns_latency_and_polls_faster():
+    model, _, page = build_page(render_delay=0.01, rows_per_page_options=(25,))
+    model.rows_by_region["United States"] = make_rows("United States", 25 * 8)
+    page.client.warm_profile = True
+    page.waits = WaitScheduler(min_samples=3)
+
+    page.open()
+    assert len(crawl_symbols(page)) == 200
+
+    # render de ~10ms: poll aprendido fica bem abaixo dos 0.2s fixos
+    assert page.waits.poll("next_page", 0.2) < 0.2
+    assert page.waits.timeout("next_page", 15) == page.waits.min_timeout
+
+
+def test_fixed_timeouts_without_wait_scheduler():
+    _, _, page = build_page()
+
+    assert page.waits is None
+    assert page._adaptive_timeout("next_page", 15) == 15
+
+
+def test_slow_page_after_learning_recovers_without_duplicates():
+    model, _, page = build_page(render_delay=0.005, rows_per_page_options=(25,))
+    model.rows_by_region["United States"] = make_rows("United States", 25 * 8)
+    page.client.warm_profile = True
+    page.waits = WaitScheduler(min_samples=3, min_timeout=0.05)
+    page.open()
+
+    parser = EquityParser()
+    symbols = []
+    for n, table_html in enumerate(page.iter_pages_table_html(), start=1):
+        symbols += [r["symbol"] for r in parser.parse(table_html)]
+        if n == 4:
+            # bem acima do prazo aprendido (~0.05s): o wait rápido estoura e o
+            # recovery (prazo fixo) precisa segurar até o render
+            model.render_delay = 0.3
+
+    assert symbols == [r["symbol"] for r in make_rows("United States", 200)]
+    # os waits que estouraram entram como amostra: o prazo aprendido volta a subir
+    assert page.waits.stats()["next_page"]["n"] == 7
+    assert page.waits.timeout("next_page", 15) > 0.05
+
+
+def test_unknown_filter_option_names_the_filter():
+    model = FakeScreener({"United States": make_rows("United States", 30)}, filters={"Sector": ("Energy",)})
+    page = YahooScreenerPage(FakeClient(FakeWebDriver(model), warm_profile=True), debug=False)
+    page.open()
+
+    with pytest.raises(RuntimeError, match="filtro 'Sector'"):
+        page.apply_filter("Sector", "Crypto")
+
+
+def test_filter_not_recorded_when_apply_never_enables(monkeypatch):
+    model, _, page = build_page()
+    page.client.warm_profile = True
+    page.open()
+    monkeypatch.setattr(page, "_click_apply_if_enabled", lambda dialog: False)
+
+    with pytest.raises(RuntimeError, match="filtro 'Region'"):
+        page.apply_filter("Region", "Brazil")
+
+    assert page.applied_filters == {}
+    assert model.applied == {"United States"}
+    assert model.dialog_open is False
+    assert page.get_result_count() == 120
+
+
+def test_hidden_no_results_text_does_not_end_loading():
+    # tbody some durante o loading e "No results" existe só em <script>/nó oculto
+    for batch_scripts in (True, False):
+        model = FakeScreener(
+            {"United States": make_rows("United States", 120)},
+            rows_per_page_options=(25,),
+            render_delay=0.02,
+            blank_while_loading=True,
+            hidden_empty_text=True,
+        )
+        driver = FakeWebDriver(model, batch_scripts=batch_scripts)
+        page = YahooScreenerPage(FakeClient(driver, warm_profile=True), debug=False)
+        page.open()
+
+        parser = EquityParser()
+        pages = [[r["symbol"] for r in parser.parse(html)] for html in page.iter_pages_table_html()]
+
+        # nenhuma página vazia entregue no meio do loading
+        assert [len(p) for p in pages] == [25, 25, 25, 25, 20]
+        assert sum(pages, []) == [r["symbol"] for r in make_rows("United States", 120)]
+        assert driver.unknown_locators == []
@@ -1,6 +1,6 @@
 from types import SimpleNamespace
 
-from app.pages.yahoo_screener_page import YahooScreenerPage
+from app.pages.yahoo_screener_page import Locators, YahooScreenerPage
 
 
 class FakeEl:
@@ -50,3 +50,39 @@ def test_page_signature_uses_first_3_rows_text():
     sig = page._page_signature()
 
     assert sig == "r1\nr2\nr3"
+
+
+class FakeButton(FakeEl):
+    def __init__(self):
+        super().__init__()
+        self.clicks = 0
+
+    def click(self):
+        self.clicks += 1
+
+
+class BannerDriver:
+    """Só responde ao locator do banner de cookies; registra cada busca."""
+
+    def __init__(self, banner_present: bool):
+        self.banner = FakeButton()
+        self.banner_present = banner_present
+        self.finds = []
+
+    def find_elements(self, by, value):
+        self.finds.append((by, value))
+        return [self.banner] if self.banner_present and (by, value) == Locators.COOKIE_ACCEPT else []
+
+
+def test_accept_cookies_skips_wait_with_warm_profile():
+    for banner_present in (False, True):
+        # wait=None: se o método tentasse esperar, quebraria
+        driver = BannerDriver(banner_present)
+        client = SimpleNamespace(driver=driver, wait=None, open=lambda url: None, warm_profile=True)
+
+        page = YahooScreenerPage(client, debug=False)
+        page._accept_cookies_if_present()
+
+        # uma única busca, sem polling
+        assert driver.finds == [Locators.COOKIE_ACCEPT]
+        assert driver.banner.clicks == (1 if banner_present else 0)